@@ -0,0 +1,106 @@
+"""Compare per-request overhead of request-scoped and app-scoped dependency wiring.
+
+Each variant mounts the same endpoint on a fresh app and drives it in-process
+through httpx's ASGI transport, so the numbers exclude networking. "resolve"
+endpoints only resolve the check use case; "lookup" endpoints also run it
+against an in-memory SQLite database. An endpoint without dependencies gives
+the fixed cost of the request itself.
+
+Usage (from the repository root):
+    PYTHONPATH=src python benchmarks/dependency_wiring.py
+    PYTHONPATH=src python benchmarks/dependency_wiring.py --requests 20000
+"""
+import os
+
+# Must be set before the application modules read their settings.
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("RATE_LIMIT_PER_SECOND", "0")
+
+import argparse
+import asyncio
+import time
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlmodel import SQLModel
+
+from assembly import (
+    build_components,
+    get_app_scoped_check_email_use_case,
+    get_request_scoped_check_email_use_case,
+)
+from db.session import database
+from domain.use_cases import CheckEmailInBlacklistUseCase
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.state.components = build_components(database)
+
+    @app.get("/baseline/{email}")
+    async def baseline(email: str):
+        return {"email": email}
+
+    @app.get("/request-scoped/resolve/{email}")
+    async def request_scoped_resolve(
+        email: str,
+        use_case: CheckEmailInBlacklistUseCase = Depends(get_request_scoped_check_email_use_case),
+    ):
+        return {"email": email}
+
+    @app.get("/app-scoped/resolve/{email}")
+    async def app_scoped_resolve(
+        email: str,
+        use_case: CheckEmailInBlacklistUseCase = Depends(get_app_scoped_check_email_use_case),
+    ):
+        return {"email": email}
+
+    @app.get("/request-scoped/lookup/{email}")
+    async def request_scoped_lookup(
+        email: str,
+        use_case: CheckEmailInBlacklistUseCase = Depends(get_request_scoped_check_email_use_case),
+    ):
+        return await use_case.execute(email)
+
+    @app.get("/app-scoped/lookup/{email}")
+    async def app_scoped_lookup(
+        email: str,
+        use_case: CheckEmailInBlacklistUseCase = Depends(get_app_scoped_check_email_use_case),
+    ):
+        return await use_case.execute(email)
+
+    return app
+
+
+async def measure(client: AsyncClient, path: str, requests: int) -> float:
+    for index in range(100):
+        await client.get(f"{path}/warmup{index}@example.com")
+    started_at = time.perf_counter()
+    for index in range(requests):
+        response = await client.get(f"{path}/user{index}@example.com")
+        response.raise_for_status()
+    return (time.perf_counter() - started_at) / requests * 1e6
+
+
+async def main(requests: int) -> None:
+    async with database.async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    app = build_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        baseline = await measure(client, "/baseline", requests)
+        print(f"{'endpoint':<26}{'us/request':>12}{'over baseline':>16}")
+        print(f"{'baseline':<26}{baseline:>12.1f}")
+        for kind in ("resolve", "lookup"):
+            for wiring in ("request-scoped", "app-scoped"):
+                elapsed = await measure(client, f"/{wiring}/{kind}", requests)
+                print(f"{wiring + ' ' + kind:<26}{elapsed:>12.1f}{elapsed - baseline:>16.1f}")
+
+    await database.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -14,4 +14,5 @@ class Blacklist(SQLModel, table=True):
     blocked_reason: Optional[str] = Field(default=None, max_length=255)
     ip_address: str = Field(nullable=False)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    expires_at: Optional[datetime] = Field(default=None, index=True)
 
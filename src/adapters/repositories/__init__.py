@@ -1,4 +1,18 @@
 from .blacklist_repository import SQLModelBlacklistRepository
+from .circuit_breaker_repository import (
+    CircuitBreaker,
+    CircuitBreakerBlacklistRepository,
+    LastKnownResults,
+)
+from .sharded_blacklist_repository import ShardedBlacklistRepository, shard_for
+from .sqlite_blacklist_repository import SQLiteBlacklistRepository
 
-__all__ = ["SQLModelBlacklistRepository"]
-
+__all__ = [
+    "SQLModelBlacklistRepository",
+    "CircuitBreaker",
+    "CircuitBreakerBlacklistRepository",
+    "LastKnownResults",
+    "ShardedBlacklistRepository",
+    "shard_for",
+    "SQLiteBlacklistRepository",
+]
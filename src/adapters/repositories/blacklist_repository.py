@@ -1,11 +1,15 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import delete, or_
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from adapters.models import Blacklist
 from domain.ports import BlacklistRepository
+from errors import DuplicateEmailError
 
 
 class SQLModelBlacklistRepository(BlacklistRepository):
@@ -18,24 +22,77 @@ class SQLModelBlacklistRepository(BlacklistRepository):
         app_uuid: UUID,
         blocked_reason: Optional[str],
         ip_address: str,
+        expires_at: Optional[datetime] = None,
     ) -> Blacklist:
+        try:
+            blacklist_entry = await self._insert(email, app_uuid, blocked_reason, ip_address, expires_at)
+            await self.session.commit()
+        except IntegrityError as error:
+            # A concurrent request inserted the same email after the use case checked for it.
+            await self.session.rollback()
+            raise DuplicateEmailError(f"Email {email} already exists in blacklist") from error
+        await self.session.refresh(blacklist_entry)
+        return blacklist_entry
+
+    async def _insert(
+        self,
+        email: str,
+        app_uuid: UUID,
+        blocked_reason: Optional[str],
+        ip_address: str,
+        expires_at: Optional[datetime],
+    ) -> Blacklist:
+        """Write the entry in the current transaction without committing it."""
+        # An expired row that the sweeper has not reached yet would still hold the unique email.
+        await self.session.execute(
+            delete(Blacklist).where(
+                Blacklist.email == email,
+                Blacklist.expires_at <= datetime.utcnow(),
+            )
+        )
         blacklist_entry = Blacklist(
             email=email,
             app_uuid=app_uuid,
             blocked_reason=blocked_reason,
             ip_address=ip_address,
+            expires_at=expires_at,
         )
         self.session.add(blacklist_entry)
-        await self.session.commit()
-        await self.session.refresh(blacklist_entry)
+        await self.session.flush()
         return blacklist_entry
 
     async def get_by_email(self, email: str) -> Optional[Blacklist]:
-        statement = select(Blacklist).where(Blacklist.email == email)
+        statement = select(Blacklist).where(
+            Blacklist.email == email,
+            or_(Blacklist.expires_at.is_(None), Blacklist.expires_at > datetime.utcnow()),
+        )
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
+
+    async def get_many_by_email(self, emails: Sequence[str]) -> list[Blacklist]:
+        if not emails:
+            return []
+        statement = select(Blacklist).where(
+            Blacklist.email.in_(emails),
+            or_(Blacklist.expires_at.is_(None), Blacklist.expires_at > datetime.utcnow()),
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
     
     async def email_exists(self, email: str) -> bool:
         result = await self.get_by_email(email)
         return result is not None
 
+    async def delete_expired(self, limit: int) -> int:
+        # Small batches picked through the expires_at index keep each transaction and its locks short.
+        expired_ids = (
+            select(Blacklist.id)
+            .where(Blacklist.expires_at <= datetime.utcnow())
+            .order_by(Blacklist.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(delete(Blacklist).where(Blacklist.id.in_(expired_ids)))
+        await self.session.commit()
+        return result.rowcount
+
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Awaitable, Callable, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from adapters.models import Blacklist
+from domain.ports import BlacklistRepository
+from errors import CircuitOpenError, ServiceUnavailableError, StaleResultError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Failures of the storage itself. Anything else is a bug and must not be hidden behind a stale answer.
+# ServiceUnavailableError includes the breaker's own CircuitOpenError; asyncio.TimeoutError is TimeoutError.
+STORAGE_ERRORS = (SQLAlchemyError, OSError, TimeoutError, ServiceUnavailableError)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fails fast after repeated errors and lets a single probe through to test recovery."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        call_timeout: float,
+        failure_types: tuple[type[BaseException], ...] = STORAGE_ERRORS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+        # Other exceptions are bugs in the caller, not signs of an outage, and leave the count alone.
+        self.failure_types = failure_types
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self.retry_after == 0:
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        if self._state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        state = self.state
+        if state is CircuitState.OPEN or (state is CircuitState.HALF_OPEN and self._probe_in_flight):
+            raise CircuitOpenError("Circuit is open", retry_after=self.retry_after or 1.0)
+
+        is_probe = state is CircuitState.HALF_OPEN
+        if is_probe:
+            self._probe_in_flight = True
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), self.call_timeout)
+        except self.failure_types:
+            self._record_failure(is_probe)
+            raise
+        finally:
+            if is_probe:
+                self._probe_in_flight = False
+        self._record_success()
+        return result
+
+    def _record_success(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+
+    def _record_failure(self, is_probe: bool) -> None:
+        self._failures += 1
+        if is_probe or self._failures >= self.failure_threshold:
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+
+class LastKnownResults:
+    """Bounded LRU of the latest lookup results, including misses."""
+
+    def __init__(self, max_size: int, max_age: float):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._entries: OrderedDict[str, tuple[Optional[Blacklist], float]] = OrderedDict()
+
+    def put(self, email: str, entry: Optional[Blacklist]) -> None:
+        self._entries[email] = (entry, time.monotonic())
+        self._entries.move_to_end(email)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, email: str) -> tuple[bool, Optional[Blacklist]]:
+        cached = self._entries.get(email)
+        if cached is None:
+            return False, None
+        entry, stored_at = cached
+        if time.monotonic() - stored_at > self.max_age:
+            del self._entries[email]
+            return False, None
+        return True, entry
+
+
+class CircuitBreakerBlacklistRepository(BlacklistRepository):
+    """Guards lookups with a circuit breaker and answers from last known results when it trips.
+
+    A stale answer is surfaced as ``StaleResultError`` so callers can flag it;
+    without one, lookups fail fast with ``ServiceUnavailableError``.
+    """
+
+    def __init__(
+        self,
+        repository: BlacklistRepository,
+        breaker: CircuitBreaker,
+        last_known: LastKnownResults,
+    ):
+        self.repository = repository
+        self.breaker = breaker
+        self.last_known = last_known
+
+    async def add_email(
+        self,
+        email: str,
+        app_uuid: UUID,
+        blocked_reason: Optional[str],
+        ip_address: str,
+        expires_at: Optional[datetime] = None,
+    ) -> Blacklist:
+        entry = await self.repository.add_email(email, app_uuid, blocked_reason, ip_address, expires_at)
+        self.last_known.put(email, entry)
+        return entry
+
+    async def get_by_email(self, email: str) -> Optional[Blacklist]:
+        try:
+            entry = await self.breaker.call(self.repository.get_by_email, email)
+        except STORAGE_ERRORS as error:
+            found, entry = self.last_known.get(email)
+            if found:
+                logger.warning("Blacklist lookup failed (%s); serving the last known result", type(error).__name__)
+                raise StaleResultError(entry if self._is_live(entry) else None) from error
+            raise self._unavailable(error) from error
+
+        self.last_known.put(email, entry)
+        return entry
+
+    async def get_many_by_email(self, emails: Sequence[str]) -> list[Blacklist]:
+        try:
+            entries = await self.breaker.call(self.repository.get_many_by_email, emails)
+        except STORAGE_ERRORS as error:
+            known = [self.last_known.get(email) for email in emails]
+            # A partial answer would report unknown emails as not blocked, so all must be known.
+            if all(found for found, _ in known):
+                logger.warning(
+                    "Batch blacklist lookup of %d emails failed (%s); serving last known results",
+                    len(emails),
+                    type(error).__name__,
+                )
+                raise StaleResultError(
+                    [entry for _, entry in known if self._is_live(entry)]
+                ) from error
+            raise self._unavailable(error) from error
+
+        found = {entry.email: entry for entry in entries}
+        for email in emails:
+            self.last_known.put(email, found.get(email))
+        return entries
+
+    def _is_live(self, entry: Optional[Blacklist]) -> bool:
+        return entry is not None and not (entry.expires_at and entry.expires_at <= datetime.utcnow())
+
+    def _unavailable(self, error: Exception) -> ServiceUnavailableError:
+        retry_after = getattr(error, "retry_after", None) or self.breaker.retry_after or 1.0
+        return ServiceUnavailableError("Blacklist storage is unavailable", retry_after=retry_after)
+
+    async def email_exists(self, email: str) -> bool:
+        try:
+            return await self.get_by_email(email) is not None
+        except StaleResultError as stale:
+            return stale.result is not None
+
+    async def delete_expired(self, limit: int) -> int:
+        return await self.repository.delete_expired(limit)
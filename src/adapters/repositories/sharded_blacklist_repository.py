@@ -0,0 +1,92 @@
+import asyncio
+import hashlib
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from adapters.models import Blacklist
+from domain.ports import BlacklistRepository
+from errors import StaleResultError
+
+T = TypeVar("T")
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def shard_for(email: str, shard_count: int) -> int:
+    """Stable shard index for ``email``; unlike ``hash()`` it does not change between processes."""
+    digest = hashlib.blake2b(normalize_email(email).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+async def gather_shards(*calls: Awaitable[T]) -> list[T]:
+    """Await every shard call, then raise the first failure.
+
+    A failing shard must not leave the others running while the request closes
+    their sessions, so nothing is raised until all of them have finished.
+    """
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class ShardedBlacklistRepository(BlacklistRepository):
+    """Routes each email to one of several repositories by a hash of the normalized address."""
+
+    def __init__(self, shards: Sequence[BlacklistRepository]):
+        if not shards:
+            raise ValueError("At least one shard is required")
+        self.shards = list(shards)
+
+    def shard_for(self, email: str) -> BlacklistRepository:
+        return self.shards[shard_for(email, len(self.shards))]
+
+    async def add_email(
+        self,
+        email: str,
+        app_uuid: UUID,
+        blocked_reason: Optional[str],
+        ip_address: str,
+        expires_at: Optional[datetime] = None,
+    ) -> Blacklist:
+        return await self.shard_for(email).add_email(
+            email, app_uuid, blocked_reason, ip_address, expires_at
+        )
+
+    async def get_by_email(self, email: str) -> Optional[Blacklist]:
+        return await self.shard_for(email).get_by_email(email)
+
+    async def get_many_by_email(self, emails: Sequence[str]) -> list[Blacklist]:
+        by_shard: dict[int, list[str]] = defaultdict(list)
+        for email in emails:
+            by_shard[shard_for(email, len(self.shards))].append(email)
+        results = await asyncio.gather(
+            *(self.shards[index].get_many_by_email(batch) for index, batch in by_shard.items()),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors and not all(isinstance(error, StaleResultError) for error in errors):
+            raise next(error for error in errors if not isinstance(error, StaleResultError))
+        entries = [
+            entry
+            for result in results
+            for entry in (result.result if isinstance(result, StaleResultError) else result)
+        ]
+        if errors:
+            # Shards guarded separately: one answering from last known results makes the whole answer stale.
+            raise StaleResultError(entries) from errors[0]
+        return entries
+
+    async def email_exists(self, email: str) -> bool:
+        return await self.shard_for(email).email_exists(email)
+
+    async def delete_expired(self, limit: int) -> int:
+        per_shard = math.ceil(limit / len(self.shards))
+        deleted = await gather_shards(*(shard.delete_expired(per_shard) for shard in self.shards))
+        return sum(deleted)
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from adapters.models import Blacklist
+from adapters.repositories.blacklist_repository import SQLModelBlacklistRepository
+from db.sqlite import SQLiteWriteQueue
+from errors import DuplicateEmailError
+
+
+class SQLiteBlacklistRepository(SQLModelBlacklistRepository):
+    """Reads on the request session; writes go through the database's single-writer queue."""
+
+    def __init__(self, session: AsyncSession, write_queue: SQLiteWriteQueue):
+        super().__init__(session)
+        self.write_queue = write_queue
+
+    async def add_email(
+        self,
+        email: str,
+        app_uuid: UUID,
+        blocked_reason: Optional[str],
+        ip_address: str,
+        expires_at: Optional[datetime] = None,
+    ) -> Blacklist:
+        async def write(session: AsyncSession) -> Blacklist:
+            return await SQLModelBlacklistRepository(session)._insert(
+                email, app_uuid, blocked_reason, ip_address, expires_at
+            )
+
+        try:
+            return await self.write_queue.submit(write)
+        except IntegrityError as error:
+            raise DuplicateEmailError(f"Email {email} already exists in blacklist") from error
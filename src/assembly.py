@@ -1,12 +1,80 @@
-from typing import AsyncGenerator
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import AsyncGenerator, AsyncIterator, Optional, Sequence
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from adapters.repositories import SQLModelBlacklistRepository
-from db.session import database
+from adapters.repositories import (
+    CircuitBreaker,
+    CircuitBreakerBlacklistRepository,
+    LastKnownResults,
+    ShardedBlacklistRepository,
+    SQLiteBlacklistRepository,
+    SQLModelBlacklistRepository,
+)
+from config import settings
+from db.session import Database, database
 from domain.ports import BlacklistRepository
-from domain.use_cases import AddEmailToBlacklistUseCase, CheckEmailInBlacklistUseCase
+from domain.use_cases import (
+    AddEmailToBlacklistUseCase,
+    CheckEmailInBlacklistUseCase,
+    CheckEmailsInBlacklistUseCase,
+    PurgeExpiredEntriesUseCase,
+)
+
+# Shared across requests so failures and last known results outlive a single session.
+# One breaker per shard: an outage of one shard must not fail lookups routed to the others.
+_lookup_guards: dict[int, tuple[CircuitBreaker, LastKnownResults]] = {}
+
+
+def lookup_guard(shard: int, shard_count: int) -> tuple[CircuitBreaker, LastKnownResults]:
+    guard = _lookup_guards.get(shard)
+    if guard is None:
+        guard = _lookup_guards[shard] = (
+            CircuitBreaker(
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_timeout=settings.circuit_reset_timeout,
+                call_timeout=settings.db_call_timeout,
+            ),
+            LastKnownResults(
+                max_size=max(1, settings.stale_cache_size // shard_count),
+                max_age=settings.stale_max_age,
+            ),
+        )
+    return guard
+
+
+def _default_ttl() -> Optional[timedelta]:
+    if settings.block_default_ttl_days is None:
+        return None
+    return timedelta(days=settings.block_default_ttl_days)
+
+
+def _shard_repository(db: Database, shard: int, session: AsyncSession) -> BlacklistRepository:
+    write_queue = db.write_queue_for(shard)
+    if write_queue is not None:
+        return SQLiteBlacklistRepository(session, write_queue)
+    return SQLModelBlacklistRepository(session)
+
+
+def _blacklist_repository(
+    db: Database, sessions: Sequence[AsyncSession], guarded: bool = False
+) -> BlacklistRepository:
+    """The repository over every shard; ``guarded`` wraps each shard in its own circuit breaker."""
+    repositories = [_shard_repository(db, shard, session) for shard, session in enumerate(sessions)]
+    if guarded:
+        repositories = [
+            CircuitBreakerBlacklistRepository(repository, *lookup_guard(shard, len(repositories)))
+            for shard, repository in enumerate(repositories)
+        ]
+    if len(repositories) == 1:
+        return repositories[0]
+    return ShardedBlacklistRepository(repositories)
+
+
+# Request-scoped wiring: the repository and use cases are rebuilt for every request.
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -14,20 +82,106 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_shard_sessions() -> AsyncGenerator[list[AsyncSession], None]:
+    async for sessions in database.get_shard_sessions():
+        yield sessions
+
+
 def get_blacklist_repository(
-    session: AsyncSession = Depends(get_session),
+    sessions: list[AsyncSession] = Depends(get_shard_sessions),
 ) -> BlacklistRepository:
-    return SQLModelBlacklistRepository(session)
+    return _blacklist_repository(database, sessions)
 
 
-def get_add_email_use_case(
+def get_request_scoped_add_email_use_case(
     repository: BlacklistRepository = Depends(get_blacklist_repository),
 ) -> AddEmailToBlacklistUseCase:
-    return AddEmailToBlacklistUseCase(repository)
+    return AddEmailToBlacklistUseCase(repository, default_ttl=_default_ttl())
 
 
-def get_check_email_use_case(
-    repository: BlacklistRepository = Depends(get_blacklist_repository),
+def get_guarded_blacklist_repository(
+    sessions: list[AsyncSession] = Depends(get_shard_sessions),
+) -> BlacklistRepository:
+    return _blacklist_repository(database, sessions, guarded=True)
+
+
+def get_request_scoped_check_email_use_case(
+    repository: BlacklistRepository = Depends(get_guarded_blacklist_repository),
 ) -> CheckEmailInBlacklistUseCase:
     return CheckEmailInBlacklistUseCase(repository)
 
+
+def get_request_scoped_batch_check_email_use_case(
+    repository: BlacklistRepository = Depends(get_guarded_blacklist_repository),
+) -> CheckEmailsInBlacklistUseCase:
+    return CheckEmailsInBlacklistUseCase(repository)
+
+
+# App-scoped wiring: built once in the lifespan; only the sessions behind
+# ``Database.scoped_sessions`` change from one request to the next.
+
+
+@dataclass
+class Components:
+    database: Database
+    add_email_use_case: AddEmailToBlacklistUseCase
+    check_email_use_case: CheckEmailInBlacklistUseCase
+    batch_check_email_use_case: CheckEmailsInBlacklistUseCase
+
+
+def build_components(db: Database = database) -> Components:
+    repository = _blacklist_repository(db, db.scoped_sessions)
+    guarded = _blacklist_repository(db, db.scoped_sessions, guarded=True)
+    return Components(
+        database=db,
+        add_email_use_case=AddEmailToBlacklistUseCase(repository, default_ttl=_default_ttl()),
+        check_email_use_case=CheckEmailInBlacklistUseCase(guarded),
+        batch_check_email_use_case=CheckEmailsInBlacklistUseCase(guarded),
+    )
+
+
+async def get_components(request: Request) -> AsyncGenerator[Components, None]:
+    components: Optional[Components] = getattr(request.app.state, "components", None)
+    if components is None:
+        # The lifespan normally builds them; this covers apps served without one.
+        components = request.app.state.components = build_components()
+    async with components.database.session_scope():
+        yield components
+
+
+# Dependencies are async so FastAPI resolves them inline instead of in its threadpool.
+async def get_app_scoped_add_email_use_case(
+    components: Components = Depends(get_components),
+) -> AddEmailToBlacklistUseCase:
+    return components.add_email_use_case
+
+
+async def get_app_scoped_check_email_use_case(
+    components: Components = Depends(get_components),
+) -> CheckEmailInBlacklistUseCase:
+    return components.check_email_use_case
+
+
+async def get_app_scoped_batch_check_email_use_case(
+    components: Components = Depends(get_components),
+) -> CheckEmailsInBlacklistUseCase:
+    return components.batch_check_email_use_case
+
+
+if settings.app_scoped_wiring:
+    get_add_email_use_case = get_app_scoped_add_email_use_case
+    get_check_email_use_case = get_app_scoped_check_email_use_case
+    get_batch_check_email_use_case = get_app_scoped_batch_check_email_use_case
+else:
+    get_add_email_use_case = get_request_scoped_add_email_use_case
+    get_check_email_use_case = get_request_scoped_check_email_use_case
+    get_batch_check_email_use_case = get_request_scoped_batch_check_email_use_case
+
+
+@asynccontextmanager
+async def purge_expired_entries_use_case() -> AsyncIterator[PurgeExpiredEntriesUseCase]:
+    """Builds the use case on its own session, for work outside a request."""
+    # aclosing: an error in the caller's block must close the sessions now, not when the generator is collected.
+    async with aclosing(get_shard_sessions()) as shard_sessions:
+        async for sessions in shard_sessions:
+            yield PurgeExpiredEntriesUseCase(get_blacklist_repository(sessions))
@@ -0,0 +1,22 @@
+from .blacklist_client import BlacklistClient
+from .cache import TTLCache
+from .errors import (
+    BlacklistClientError,
+    DuplicateEmailError,
+    RateLimitedError,
+    ServiceUnavailableError,
+    UnauthorizedError,
+)
+from .models import BlacklistCheckResponse, BlacklistCreateResponse
+
+__all__ = [
+    "BlacklistCheckResponse",
+    "BlacklistClient",
+    "BlacklistClientError",
+    "BlacklistCreateResponse",
+    "DuplicateEmailError",
+    "RateLimitedError",
+    "ServiceUnavailableError",
+    "TTLCache",
+    "UnauthorizedError",
+]
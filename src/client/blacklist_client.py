@@ -0,0 +1,271 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Union
+from urllib.parse import quote
+from uuid import UUID
+
+import httpx
+
+from client.cache import TTLCache
+from client.errors import (
+    DuplicateEmailError,
+    RateLimitedError,
+    ServiceUnavailableError,
+    UnauthorizedError,
+)
+from client.models import BlacklistCheckResponse, BlacklistCreateResponse
+
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+BATCH_UNSUPPORTED_STATUSES = {404, 405}
+
+
+class BlacklistClient:
+    """Async client for the Blacklist API.
+
+    Lookups are cached locally: blocked emails until ``cache_ttl`` or their
+    ``expires_at``, whichever comes first, and misses for the shorter
+    ``negative_cache_ttl`` so blocks made elsewhere show up quickly. Stale
+    answers served while the API's database is down are never cached.
+
+    Lookups issued concurrently within ``batch_window`` seconds are sent as a
+    single ``POST /blacklists/batch-check``, falling back to individual
+    ``GET`` requests when the server does not offer that endpoint.
+
+    Lookups are retried with jittered backoff, but never sooner than a
+    ``Retry-After`` the server sends. A pause longer than ``max_retry_after``
+    is not waited for: the error is raised with its ``retry_after`` instead.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        *,
+        timeout: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        cache_size: int = 10_000,
+        cache_ttl: float = 60.0,
+        negative_cache_ttl: float = 5.0,
+        batch_window: float = 0.005,
+        max_batch_size: int = 100,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 5.0,
+        max_retry_after: float = 5.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.cache_ttl = cache_ttl
+        self.negative_cache_ttl = negative_cache_ttl
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            transport=transport,
+        )
+        self._cache: TTLCache[str, BlacklistCheckResponse] = TTLCache(cache_size)
+        self._pending: dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: set[asyncio.Task] = set()
+        # None until the first batch request tells us whether the server supports it.
+        self._batch_supported: Optional[bool] = None
+
+    async def __aenter__(self) -> "BlacklistClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        await self._http.aclose()
+
+    async def check_email(self, email: str) -> BlacklistCheckResponse:
+        cached = self._cache.get(email)
+        if cached is not None:
+            return cached
+
+        future = self._pending.get(email)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[email] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        # Other callers may be waiting on the same lookup, so cancelling one must not cancel it.
+        return await asyncio.shield(future)
+
+    async def check_emails(self, emails: Iterable[str]) -> list[BlacklistCheckResponse]:
+        return list(await asyncio.gather(*(self.check_email(email) for email in emails)))
+
+    async def add_email(
+        self,
+        email: str,
+        app_uuid: Union[UUID, str],
+        blocked_reason: Optional[str] = None,
+        expires_at: Optional[datetime] = None,
+    ) -> BlacklistCreateResponse:
+        body: dict[str, Any] = {"email": email, "app_uuid": str(app_uuid)}
+        if blocked_reason is not None:
+            body["blocked_reason"] = blocked_reason
+        if expires_at is not None:
+            body["expires_at"] = expires_at.isoformat()
+        response = await self._request("POST", "/blacklists", idempotent=False, json=body)
+        self._cache.invalidate(email)
+        if response.status_code == 409:
+            raise DuplicateEmailError(self._detail(response))
+        self._raise_for_status(response)
+        return BlacklistCreateResponse.model_validate(response.json())
+
+    def invalidate(self, email: Optional[str] = None) -> None:
+        """Drop one cached lookup, or all of them."""
+        if email is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(email)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._resolve(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _resolve(self, batch: dict[str, asyncio.Future]) -> None:
+        emails = list(batch)
+        try:
+            results = await self._lookup(emails)
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+                    # Waiters may all have been cancelled; do not warn about an unread error.
+                    future.exception()
+            return
+
+        for email, result in zip(emails, results):
+            future = batch[email]
+            if isinstance(result, Exception):
+                if not future.done():
+                    future.set_exception(result)
+                    future.exception()
+                continue
+            if not result.is_stale:
+                self._cache.put(email, result, self._ttl_for(result))
+            if not future.done():
+                future.set_result(result)
+
+    async def _lookup(self, emails: list[str]) -> list[Union[BlacklistCheckResponse, Exception]]:
+        if len(emails) > 1 and self._batch_supported is not False:
+            response = await self._request("POST", "/blacklists/batch-check", json={"emails": emails})
+            if response.status_code in BATCH_UNSUPPORTED_STATUSES:
+                self._batch_supported = False
+            else:
+                self._batch_supported = True
+                self._raise_for_status(response)
+                is_stale = self._is_stale(response)
+                return [
+                    BlacklistCheckResponse.model_validate(result).model_copy(update={"is_stale": is_stale})
+                    for result in response.json()["results"]
+                ]
+        # Without the batch endpoint one failed lookup must not fail the others.
+        return list(await asyncio.gather(*(self._get(email) for email in emails), return_exceptions=True))
+
+    async def _get(self, email: str) -> BlacklistCheckResponse:
+        response = await self._request("GET", f"/blacklists/{quote(email, safe='@')}")
+        self._raise_for_status(response)
+        return BlacklistCheckResponse.model_validate(response.json()).model_copy(
+            update={"is_stale": self._is_stale(response)}
+        )
+
+    async def _request(self, method: str, url: str, idempotent: bool = True, **kwargs) -> httpx.Response:
+        """Send a request, retrying failures that are safe to retry.
+
+        Idempotent calls are retried on connection errors, timeouts and
+        429/502/503/504 responses; other calls only when the connection could not
+        be opened, since the request never reached the server.
+        """
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = await self._http.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt == self.max_retries:
+                    raise
+            except httpx.TransportError:
+                if not idempotent or attempt == self.max_retries:
+                    raise
+            else:
+                if not idempotent or response.status_code not in RETRYABLE_STATUSES:
+                    return response
+                if attempt == self.max_retries:
+                    return response
+                retry_after = self._retry_after(response)
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    # The server asked for a longer pause than we are willing to wait.
+                    return response
+            backoff = self._backoff(attempt)
+            await asyncio.sleep(max(backoff, retry_after) if retry_after is not None else backoff)
+        raise AssertionError("unreachable")
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _ttl_for(self, result: BlacklistCheckResponse) -> float:
+        if not result.is_blocked:
+            return self.negative_cache_ttl
+        ttl = self.cache_ttl
+        if result.expires_at is not None:
+            expires_at = result.expires_at
+            if expires_at.tzinfo is not None:
+                expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+            ttl = min(ttl, (expires_at - datetime.utcnow()).total_seconds())
+        return ttl
+
+    @staticmethod
+    def _is_stale(response: httpx.Response) -> bool:
+        return response.headers.get("X-Data-Stale", "").lower() == "true"
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        try:
+            return max(0.0, float(response.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _detail(response: httpx.Response) -> str:
+        try:
+            return str(response.json().get("detail", response.text))
+        except ValueError:
+            return response.text
+
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        if response.status_code == 401:
+            raise UnauthorizedError(self._detail(response))
+        if response.status_code == 429:
+            raise RateLimitedError(self._detail(response), retry_after=self._retry_after(response) or 1.0)
+        if response.status_code == 503:
+            raise ServiceUnavailableError(
+                self._detail(response), retry_after=self._retry_after(response) or 1.0
+            )
+        response.raise_for_status()
@@ -0,0 +1,24 @@
+class BlacklistClientError(Exception):
+    """Base class for errors raised by ``BlacklistClient``."""
+
+
+class DuplicateEmailError(BlacklistClientError):
+    pass
+
+
+class UnauthorizedError(BlacklistClientError):
+    pass
+
+
+class ServiceUnavailableError(BlacklistClientError):
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitedError(BlacklistClientError):
+    """The server throttled this client (429); ``retry_after`` is when it will accept requests again."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class BlacklistCreateResponse(BaseModel):
+    message: str
+    email: str
+    blocked_at: datetime
+    expires_at: Optional[datetime] = None
+
+
+class BlacklistCheckResponse(BaseModel):
+    email: str
+    is_blocked: bool
+    blocked_reason: Optional[str] = None
+    blocked_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    # Set from the X-Data-Stale header: the server answered from last known results.
+    is_stale: bool = Field(False, exclude=True)
@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings:
@@ -11,6 +12,10 @@ class Settings:
     @property
     @lru_cache()
     def db_url(self) -> str:
+        # e.g. sqlite+aiosqlite:///./blacklist.db for sidecar deployments.
+        db_url = os.getenv("DB_URL")
+        if db_url:
+            return db_url
         rds_host = os.getenv("RDS_HOSTNAME")
         rds_user = os.getenv("RDS_USERNAME")
         rds_pass = os.getenv("RDS_PASSWORD")
@@ -18,15 +23,171 @@ class Settings:
         rds_port = os.getenv("RDS_PORT", "5432")
         return f"postgresql+asyncpg://{rds_user}:{rds_pass}@{rds_host}:{rds_port}/{rds_db}"
     
+    @property
+    @lru_cache()
+    def db_shard_urls(self) -> list[str]:
+        # Comma separated; the first URL is shard 0 and replaces db_url.
+        value = os.getenv("DB_SHARD_URLS", "")
+        return [url.strip() for url in value.split(",") if url.strip()]
+
     @property
     @lru_cache()
     def db_echo(self) -> bool:
         return os.getenv("DB_ECHO", "False").lower() == "true"
     
+    @property
+    @lru_cache()
+    def db_pool_size(self) -> int:
+        return int(os.getenv("DB_POOL_SIZE", "5"))
+
+    @property
+    @lru_cache()
+    def db_max_overflow(self) -> int:
+        return int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+    @property
+    @lru_cache()
+    def db_pool_timeout(self) -> float:
+        return float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+    @property
+    @lru_cache()
+    def sqlite_synchronous(self) -> str:
+        return os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+
+    @property
+    @lru_cache()
+    def sqlite_mmap_size(self) -> int:
+        return int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+    @property
+    @lru_cache()
+    def sqlite_cache_size(self) -> int:
+        # Negative values are KiB, as in PRAGMA cache_size.
+        return int(os.getenv("SQLITE_CACHE_SIZE", str(-64 * 1024)))
+
+    @property
+    @lru_cache()
+    def sqlite_busy_timeout(self) -> int:
+        return int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    @property
+    @lru_cache()
+    def sqlite_write_batch_size(self) -> int:
+        return int(os.getenv("SQLITE_WRITE_BATCH_SIZE", "64"))
+
+    @property
+    @lru_cache()
+    def db_call_timeout(self) -> float:
+        return float(os.getenv("DB_CALL_TIMEOUT", "1.0"))
+
+    @property
+    @lru_cache()
+    def circuit_failure_threshold(self) -> int:
+        return int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+    @property
+    @lru_cache()
+    def circuit_reset_timeout(self) -> float:
+        return float(os.getenv("CIRCUIT_RESET_TIMEOUT", "10"))
+
+    @property
+    @lru_cache()
+    def stale_cache_size(self) -> int:
+        return int(os.getenv("STALE_CACHE_SIZE", "10000"))
+
+    @property
+    @lru_cache()
+    def stale_max_age(self) -> float:
+        return float(os.getenv("STALE_MAX_AGE", "3600"))
+
+    @property
+    @lru_cache()
+    def slow_query_threshold_ms(self) -> float:
+        return float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+
+    @property
+    @lru_cache()
+    def slow_query_explain(self) -> bool:
+        return os.getenv("SLOW_QUERY_EXPLAIN", "False").lower() == "true"
+
+    @property
+    @lru_cache()
+    def slow_query_explain_interval(self) -> float:
+        return float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "10"))
+
+    @property
+    @lru_cache()
+    def profiler_max_seconds(self) -> float:
+        return float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+    @property
+    @lru_cache()
+    def block_default_ttl_days(self) -> Optional[float]:
+        value = os.getenv("BLOCK_DEFAULT_TTL_DAYS")
+        return float(value) if value else None
+
+    @property
+    @lru_cache()
+    def sweeper_interval(self) -> float:
+        return float(os.getenv("SWEEPER_INTERVAL", "60"))
+
+    @property
+    @lru_cache()
+    def sweeper_batch_size(self) -> int:
+        return int(os.getenv("SWEEPER_BATCH_SIZE", "500"))
+
+    @property
+    @lru_cache()
+    def sweeper_batch_pause(self) -> float:
+        return float(os.getenv("SWEEPER_BATCH_PAUSE", "0.05"))
+
+    @property
+    @lru_cache()
+    def app_scoped_wiring(self) -> bool:
+        return os.getenv("APP_SCOPED_WIRING", "True").lower() == "true"
+
+    @property
+    @lru_cache()
+    def batch_check_max_emails(self) -> int:
+        return int(os.getenv("BATCH_CHECK_MAX_EMAILS", "100"))
+
+    @property
+    @lru_cache()
+    def fast_email_validation(self) -> bool:
+        return os.getenv("FAST_EMAIL_VALIDATION", "True").lower() == "true"
+
+    @property
+    @lru_cache()
+    def email_domain_cache_size(self) -> int:
+        return int(os.getenv("EMAIL_DOMAIN_CACHE_SIZE", "4096"))
+
     @property
     @lru_cache()
     def auth_token(self) -> str:
         return os.getenv("AUTH_TOKEN", "bearer-token-static-2024")
 
+    @property
+    @lru_cache()
+    def admission_max_concurrency(self) -> int:
+        # By default no more requests are admitted than the pool can serve at once.
+        default = self.db_pool_size + self.db_max_overflow
+        return int(os.getenv("ADMISSION_MAX_CONCURRENCY", str(default)))
+
+    @property
+    @lru_cache()
+    def admission_queue_timeout(self) -> float:
+        return float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "0.1"))
+
+    @property
+    @lru_cache()
+    def rate_limit_per_second(self) -> float:
+        return float(os.getenv("RATE_LIMIT_PER_SECOND", "50"))
+
+    @property
+    @lru_cache()
+    def rate_limit_burst(self) -> int:
+        return int(os.getenv("RATE_LIMIT_BURST", "100"))
+
 
 settings = Settings()
\ No newline at end of file
@@ -1,28 +1,138 @@
-from typing import AsyncGenerator, Optional
+from contextlib import AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, AsyncIterator, Optional, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config import settings
+from db.slow_query import TimedAsyncQueuePool, slow_query_log
+from db.sqlite import SQLiteWriteQueue, configure_sqlite, is_memory_url, is_sqlite_url
+
+_session_scope: ContextVar[Optional[object]] = ContextVar("db_session_scope", default=None)
+
+
+def current_session_scope() -> object:
+    scope = _session_scope.get()
+    if scope is None:
+        raise RuntimeError("No database session scope is active; use Database.session_scope()")
+    return scope
 
 
 class Database:
-    def __init__(self, database_url: Optional[str] = None):
-        self.database_url = database_url or settings.db_url
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        shard_urls: Optional[Sequence[str]] = None,
+    ):
+        shard_urls = list(shard_urls if shard_urls is not None else settings.db_shard_urls)
+        self.database_url = database_url or (shard_urls[0] if shard_urls else settings.db_url)
+        # The primary database doubles as shard 0.
+        self.shard_urls = shard_urls or [self.database_url]
         self._async_engine: Optional[AsyncEngine] = None
+        self._shard_engines: Optional[list[AsyncEngine]] = None
+        self._write_queues: dict[AsyncEngine, SQLiteWriteQueue] = {}
+        self._scoped_sessions: Optional[list[async_scoped_session]] = None
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        if is_sqlite_url(url):
+            return self._create_sqlite_engine(url)
+        engine = create_async_engine(
+            url,
+            echo=settings.db_echo,
+            future=True,
+            poolclass=TimedAsyncQueuePool,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+        slow_query_log.attach(engine)
+        return engine
+
+    def _create_sqlite_engine(self, url: str) -> AsyncEngine:
+        if is_memory_url(url):
+            # Every connection to :memory: is a new database, so share a single one.
+            pool_options = {"poolclass": StaticPool}
+        else:
+            pool_options = {
+                "poolclass": TimedAsyncQueuePool,
+                "pool_size": settings.db_pool_size,
+                "max_overflow": settings.db_max_overflow,
+                "pool_timeout": settings.db_pool_timeout,
+            }
+        engine = create_async_engine(url, echo=settings.db_echo, future=True, **pool_options)
+        configure_sqlite(engine)
+        slow_query_log.attach(engine)
+        self._write_queues[engine] = SQLiteWriteQueue(engine, max_batch=settings.sqlite_write_batch_size)
+        return engine
 
     @property
     def async_engine(self) -> AsyncEngine:
         if self._async_engine is None:
-            self._async_engine = create_async_engine(
-                self.database_url,
-                echo=settings.db_echo,
-                future=True,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-            )
+            self._async_engine = self._create_engine(self.database_url)
         return self._async_engine
 
+    @property
+    def shard_engines(self) -> list[AsyncEngine]:
+        if self._shard_engines is None:
+            self._shard_engines = [self.async_engine] + [
+                self._create_engine(url) for url in self.shard_urls[1:]
+            ]
+        return self._shard_engines
+
+    @property
+    def is_sharded(self) -> bool:
+        return len(self.shard_urls) > 1
+
+    @property
+    def scoped_sessions(self) -> list[async_scoped_session]:
+        """One session proxy per shard, resolving to the session of the active scope.
+
+        Long-lived objects can hold these and still use a fresh session per
+        request; see ``session_scope``.
+        """
+        if self._scoped_sessions is None:
+            self._scoped_sessions = [
+                async_scoped_session(
+                    async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+                    scopefunc=current_session_scope,
+                )
+                for engine in self.shard_engines
+            ]
+        return self._scoped_sessions
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[None]:
+        """Give the current task, and tasks it spawns, their own sessions until exit.
+
+        Sessions are only created when first used, so shards the scope never
+        touches cost nothing.
+        """
+        token = _session_scope.set(object())
+        try:
+            yield
+        except Exception:
+            for scoped_session in self.scoped_sessions:
+                if scoped_session.registry.has():
+                    await scoped_session.rollback()
+            raise
+        finally:
+            for scoped_session in self.scoped_sessions:
+                await scoped_session.remove()
+            _session_scope.reset(token)
+
+    def write_queue_for(self, shard: int) -> Optional[SQLiteWriteQueue]:
+        """Single-writer queue of a SQLite shard, None for other backends."""
+        return self._write_queues.get(self.shard_engines[shard])
+
     async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
         """Dependency for FastAPI to inject async sessions."""
         async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
@@ -32,10 +142,31 @@ class Database:
                 await session.rollback()
                 raise
 
+    async def get_shard_sessions(self) -> AsyncGenerator[list[AsyncSession], None]:
+        """Yield one session per shard, in shard order.
+
+        Sessions only check out a connection when first used, so shards a
+        request never touches cost nothing.
+        """
+        async with AsyncExitStack() as stack:
+            sessions = [
+                await stack.enter_async_context(AsyncSession(engine, expire_on_commit=False))
+                for engine in self.shard_engines
+            ]
+            try:
+                yield sessions
+            except Exception:
+                for session in sessions:
+                    await session.rollback()
+                raise
+
     async def close(self) -> None:
         """Close database connection."""
-        if self._async_engine:
-            await self._async_engine.dispose()
+        for write_queue in self._write_queues.values():
+            await write_queue.close()
+        for engine in self._shard_engines or [self._async_engine]:
+            if engine:
+                await engine.dispose()
 
 
 # Global database instance
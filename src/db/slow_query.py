@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    StaticPool,
+)
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+POOL_WAIT_KEY = "slow_query_pool_wait"
+STARTED_AT_KEY = "slow_query_started_at"
+EXPLAIN_PREFIXES = {"postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Records how long each checkout waited for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        record = super()._do_get()
+        record.info[POOL_WAIT_KEY] = time.perf_counter() - started_at
+        return record
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: str
+    duration_ms: float
+    pool_wait_ms: Optional[float]
+    plan: Optional[list[str]] = None
+    recorded_at: datetime = field(default_factory=datetime.utcnow)
+
+
+def describe_parameters(parameters: Any, executemany: bool = False) -> str:
+    """Describe the shape of bound parameters without logging their values."""
+    if executemany:
+        rows = list(parameters or [])
+        first = describe_parameters(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "()"
+
+
+class SlowQueryLog:
+    """Logs statements slower than ``threshold_ms`` and keeps the most recent ones.
+
+    With ``explain`` on, the plan of a slow ``SELECT`` is fetched after the
+    request's statement returns, in a background task on a dedicated unpooled
+    connection, so it never competes with requests for the pool. At most one
+    EXPLAIN runs at a time and at most one every ``explain_interval`` seconds;
+    slow queries in between are recorded without a plan.
+
+    On SQLite, SQLAlchemy emits ``BEGIN`` itself, so the time spent waiting for
+    the pool is attributed to the first statement after it instead.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain: bool = False,
+        max_entries: int = 100,
+        explain_interval: float = 10.0,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self._entries: deque[SlowQuery] = deque(maxlen=max_entries)
+        self._last_explain_at = float("-inf")
+        self._explain_task: Optional[asyncio.Task] = None
+        self._explain_engines: dict[Engine, AsyncEngine] = {}
+
+    def attach(self, engine: Union[AsyncEngine, Engine]) -> None:
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def recent(self) -> list[SlowQuery]:
+        return list(self._entries)
+
+    async def wait_for_explain(self) -> None:
+        """Wait for the EXPLAIN in flight, if any, to finish."""
+        if self._explain_task is not None:
+            await asyncio.wait([self._explain_task])
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info[STARTED_AT_KEY] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started_at = conn.info.pop(STARTED_AT_KEY, None)
+        if started_at is None:
+            return
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        # The pool wait belongs to the first statement run after the checkout, not to a bare BEGIN.
+        if statement.strip().upper() == "BEGIN":
+            pool_wait = None
+        else:
+            pool_wait = conn.info.pop(POOL_WAIT_KEY, None)
+        if self.threshold_ms < 0 or duration_ms < self.threshold_ms:
+            return
+
+        entry = SlowQuery(
+            statement=statement,
+            parameters=describe_parameters(parameters, executemany),
+            duration_ms=round(duration_ms, 3),
+            pool_wait_ms=round(pool_wait * 1000, 3) if pool_wait is not None else None,
+        )
+        self._entries.append(entry)
+        logger.warning(
+            "Slow query: %.1f ms (pool wait %s ms) params=%s statement=%s",
+            entry.duration_ms,
+            entry.pool_wait_ms,
+            entry.parameters,
+            " ".join(statement.split()),
+        )
+        if self.explain and not executemany:
+            self._schedule_explain(conn, entry, parameters)
+
+    def _schedule_explain(self, conn: Connection, entry: SlowQuery, parameters: Any) -> None:
+        prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if prefix is None or not conn.dialect.is_async or not entry.statement.lstrip().upper().startswith("SELECT"):
+            return
+        now = time.monotonic()
+        if (self._explain_task is not None and not self._explain_task.done()) or (
+            now - self._last_explain_at < self.explain_interval
+        ):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_explain_at = now
+        self._explain_task = loop.create_task(
+            self._explain(self._explain_engine(conn.engine), entry, prefix + entry.statement, parameters)
+        )
+
+    def _explain_engine(self, engine: Engine) -> AsyncEngine:
+        """The engine EXPLAINs run on: unpooled, so it never takes a slot from requests."""
+        explain_engine = self._explain_engines.get(engine)
+        if explain_engine is None:
+            if isinstance(engine.pool, StaticPool):
+                # A single shared connection (in-memory SQLite): a new one would be another database.
+                explain_engine = AsyncEngine(engine)
+            else:
+                explain_engine = create_async_engine(engine.url, poolclass=NullPool)
+            self._explain_engines[engine] = explain_engine
+        return explain_engine
+
+    async def _explain(self, engine: AsyncEngine, entry: SlowQuery, statement: str, parameters: Any) -> None:
+        try:
+            async with engine.connect() as conn:
+                rows = (await conn.exec_driver_sql(statement, parameters)).fetchall()
+        except Exception:
+            logger.exception("Could not EXPLAIN slow query")
+            return
+        entry.plan = [" ".join(str(column) for column in row) for row in rows]
+        logger.warning("Slow query plan: %s statement=%s", entry.plan, " ".join(entry.statement.split()))
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    explain=settings.slow_query_explain,
+    explain_interval=settings.slow_query_explain_interval,
+)
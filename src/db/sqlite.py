@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def is_sqlite_url(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_memory_url(url: str) -> bool:
+    return make_url(url).database in (None, "", ":memory:")
+
+
+def configure_sqlite(engine: AsyncEngine) -> None:
+    """Apply WAL mode and tuned pragmas to every new connection.
+
+    The driver's own transaction handling is switched off and BEGIN is emitted
+    by SQLAlchemy instead, which SAVEPOINTs need to work correctly.
+    """
+    synchronous = settings.sqlite_synchronous.upper()
+    if synchronous not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS value: {settings.sqlite_synchronous}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+class SQLiteWriteQueue:
+    """Funnels writes through a single task so SQLite only ever sees one writer.
+
+    Queued writes are committed together in one transaction, each inside its own
+    SAVEPOINT so a failing write does not affect the others in the group.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_batch: int = 64):
+        self.engine = engine
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, write: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(), name="sqlite-writer")
+        future = loop.create_future()
+        await self._queue.put((write, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write_batch(batch)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("SQLite write queue closed"))
+                raise
+            except Exception as error:
+                logger.exception("SQLite write batch failed")
+                self._fail(batch, error)
+
+    def _fail(self, batch: list, error: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _write_batch(self, batch: list) -> None:
+        outcomes = []
+        async with AsyncSession(self.engine, expire_on_commit=False) as session:
+            for write, future in batch:
+                if future.cancelled():
+                    continue
+                try:
+                    async with session.begin_nested():
+                        outcomes.append((future, await write(session), None))
+                except Exception as error:
+                    outcomes.append((future, None, error))
+            await session.commit()
+
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        pending = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending, RuntimeError("SQLite write queue closed"))
+        self._worker = None
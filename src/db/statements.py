@@ -0,0 +1,12 @@
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
+
+
+def insert_ignoring_duplicates(dialect_name: str, table: Table, index_elements: list[str]) -> Insert:
+    """INSERT that silently skips rows conflicting on ``index_elements``."""
+    if dialect_name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect_name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=index_elements)
+    raise ValueError(f"Unsupported dialect: {dialect_name}")
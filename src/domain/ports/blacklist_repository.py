@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Sequence
 from uuid import UUID
 
 from adapters.models import Blacklist
@@ -13,6 +14,7 @@ class BlacklistRepository(ABC):
         app_uuid: UUID,
         blocked_reason: Optional[str],
         ip_address: str,
+        expires_at: Optional[datetime] = None,
     ) -> Blacklist:
         pass
 
@@ -20,7 +22,17 @@ class BlacklistRepository(ABC):
     async def get_by_email(self, email: str) -> Optional[Blacklist]:
         pass
     
+    @abstractmethod
+    async def get_many_by_email(self, emails: Sequence[str]) -> list[Blacklist]:
+        """Return the active entries among ``emails``; missing ones are left out."""
+        pass
+
     @abstractmethod
     async def email_exists(self, email: str) -> bool:
         pass
 
+    @abstractmethod
+    async def delete_expired(self, limit: int) -> int:
+        """Delete up to ``limit`` expired entries and return how many were removed."""
+        pass
+
@@ -1,12 +1,19 @@
 from .blacklist import (
+    BlacklistBatchCheckRequest,
+    BlacklistBatchCheckResponse,
     BlacklistCheckResponse,
     BlacklistCreateRequest,
     BlacklistCreateResponse,
 )
+from .email import FastEmailStr, validate_email_fast
 
 __all__ = [
     "BlacklistCreateRequest",
     "BlacklistCreateResponse",
     "BlacklistCheckResponse",
+    "BlacklistBatchCheckRequest",
+    "BlacklistBatchCheckResponse",
+    "FastEmailStr",
+    "validate_email_fast",
 ]
 
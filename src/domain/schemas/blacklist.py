@@ -1,20 +1,39 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
+
+from config import settings
+from domain.schemas.email import FastEmailStr
+
+EmailField = FastEmailStr if settings.fast_email_validation else EmailStr
 
 
 class BlacklistCreateRequest(BaseModel):
-    email: EmailStr
+    email: EmailField
     app_uuid: UUID
     blocked_reason: Optional[str] = Field(None, max_length=255)
+    expires_at: Optional[datetime] = None
+
+    @field_validator("expires_at")
+    @classmethod
+    def validate_expires_at(cls, value: Optional[datetime]) -> Optional[datetime]:
+        if value is None:
+            return None
+        # Stored like created_at: naive UTC.
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        if value <= datetime.utcnow():
+            raise ValueError("expires_at must be in the future")
+        return value
 
 
 class BlacklistCreateResponse(BaseModel):
     message: str
     email: str
     blocked_at: datetime
+    expires_at: Optional[datetime] = None
 
 
 class BlacklistCheckResponse(BaseModel):
@@ -22,4 +41,16 @@ class BlacklistCheckResponse(BaseModel):
     is_blocked: bool
     blocked_reason: Optional[str] = None
     blocked_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    # Set when the answer comes from last known results; reported as a header, not in the body.
+    is_stale: bool = Field(False, exclude=True)
+
+
+class BlacklistBatchCheckRequest(BaseModel):
+    emails: list[str] = Field(..., min_length=1, max_length=settings.batch_check_max_emails)
+
+
+class BlacklistBatchCheckResponse(BaseModel):
+    results: list[BlacklistCheckResponse]
+    is_stale: bool = Field(False, exclude=True)
 
@@ -0,0 +1,89 @@
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+import email_validator
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic.networks import validate_email
+from pydantic_core import core_schema
+
+from config import settings
+
+# The fast path reuses email-validator internals, which only match EmailStr for the
+# pinned version; if they move, every address takes the regular path instead.
+try:
+    from email_validator.rfc_constants import (
+        ATEXT,
+        CASE_INSENSITIVE_MAILBOX_NAMES,
+        EMAIL_MAX_LENGTH,
+    )
+    from email_validator.syntax import validate_email_domain_name
+except ImportError:  # pragma: no cover - depends on the installed email-validator
+    SIMPLE_EMAIL_RE = None
+else:
+    # Plain ASCII dot-atom local part and a hostname-like domain: the shape of nearly
+    # every real address. Anything else (quotes, display names, whitespace, Unicode,
+    # IP literals) takes the regular email-validator path.
+    SIMPLE_EMAIL_RE = re.compile(r"([" + ATEXT + r"]+(?:\.[" + ATEXT + r"]+)*)@([A-Za-z0-9.\-]+)")
+
+
+@lru_cache(maxsize=settings.email_domain_cache_size)
+def _validate_domain(
+    domain: str, test_environment: bool, globally_deliverable: bool
+) -> Optional[tuple[str, str]]:
+    """Normalized (domain, ascii_domain), or None when email-validator rejects it."""
+    try:
+        result = validate_email_domain_name(
+            domain, test_environment=test_environment, globally_deliverable=globally_deliverable
+        )
+    except email_validator.EmailNotValidError:
+        return None
+    return result["domain"], result["ascii_domain"]
+
+
+def validate_email_fast(value: str) -> str:
+    """Same result as ``EmailStr`` validation, skipping the full parse for simple addresses.
+
+    Whenever the fast path is not certain to accept the value it defers to
+    pydantic's ``validate_email``, so rejections carry exactly the same errors.
+    """
+    if SIMPLE_EMAIL_RE is None:
+        return validate_email(value)[1]
+    match = SIMPLE_EMAIL_RE.fullmatch(value)
+    if match is not None and not email_validator.STRICT:
+        local_part, domain_part = match.groups()
+        domain = _validate_domain(
+            domain_part, email_validator.TEST_ENVIRONMENT, email_validator.GLOBALLY_DELIVERABLE
+        )
+        if domain is not None:
+            unicode_domain, ascii_domain = domain
+            if local_part.lower() in CASE_INSENSITIVE_MAILBOX_NAMES:
+                local_part = local_part.lower()
+            normalized = f"{local_part}@{unicode_domain}"
+            longest = max(
+                len(value),
+                len(normalized.encode("utf-8")),
+                len(local_part) + 1 + len(ascii_domain),
+            )
+            if longest <= EMAIL_MAX_LENGTH:
+                return normalized
+    return validate_email(value)[1]
+
+
+class FastEmailStr(str):
+    """Drop-in replacement for ``pydantic.EmailStr`` backed by ``validate_email_fast``."""
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, _source: type[Any], _handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_after_validator_function(validate_email_fast, core_schema.str_schema())
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        field_schema = handler(schema)
+        field_schema.update(type="string", format="email")
+        return field_schema
@@ -1,8 +1,11 @@
 from .add_email_to_blacklist import AddEmailToBlacklistUseCase
 from .check_email_in_blacklist import CheckEmailInBlacklistUseCase
+from .check_emails_in_blacklist import CheckEmailsInBlacklistUseCase
+from .purge_expired_entries import PurgeExpiredEntriesUseCase
 
 __all__ = [
     "AddEmailToBlacklistUseCase",
     "CheckEmailInBlacklistUseCase",
+    "CheckEmailsInBlacklistUseCase",
+    "PurgeExpiredEntriesUseCase",
 ]
-
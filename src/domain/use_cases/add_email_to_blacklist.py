@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID
 
 from domain.ports import BlacklistRepository
@@ -7,8 +9,9 @@ from errors import DuplicateEmailError
 
 
 class AddEmailToBlacklistUseCase(BaseUseCase[BlacklistCreateRequest, BlacklistCreateResponse]):
-    def __init__(self, repository: BlacklistRepository):
+    def __init__(self, repository: BlacklistRepository, default_ttl: Optional[timedelta] = None):
         self.repository = repository
+        self.default_ttl = default_ttl
 
     async def execute(
         self, request: BlacklistCreateRequest, ip_address: str
@@ -17,16 +20,22 @@ class AddEmailToBlacklistUseCase(BaseUseCase[BlacklistCreateRequest, BlacklistCr
         if email_exists:
             raise DuplicateEmailError(f"Email {request.email} already exists in blacklist")
         
+        expires_at = request.expires_at
+        if expires_at is None and self.default_ttl is not None:
+            expires_at = datetime.utcnow() + self.default_ttl
+
         blacklist_entry = await self.repository.add_email(
             email=request.email,
             app_uuid=request.app_uuid,
             blocked_reason=request.blocked_reason,
             ip_address=ip_address,
+            expires_at=expires_at,
         )
         
         return BlacklistCreateResponse(
             message="Email added to blacklist successfully",
             email=blacklist_entry.email,
             blocked_at=blacklist_entry.created_at,
+            expires_at=blacklist_entry.expires_at,
         )
 
@@ -1,6 +1,7 @@
 from domain.ports import BlacklistRepository
 from domain.schemas import BlacklistCheckResponse
 from domain.use_cases.base_use_case import BaseUseCase
+from errors import StaleResultError
 
 
 class CheckEmailInBlacklistUseCase(BaseUseCase[str, BlacklistCheckResponse]):
@@ -8,7 +9,12 @@ class CheckEmailInBlacklistUseCase(BaseUseCase[str, BlacklistCheckResponse]):
         self.repository = repository
 
     async def execute(self, email: str) -> BlacklistCheckResponse:
-        blacklist_entry = await self.repository.get_by_email(email)
+        try:
+            blacklist_entry = await self.repository.get_by_email(email)
+            is_stale = False
+        except StaleResultError as stale:
+            blacklist_entry = stale.result
+            is_stale = True
         
         if blacklist_entry:
             return BlacklistCheckResponse(
@@ -16,6 +22,8 @@ class CheckEmailInBlacklistUseCase(BaseUseCase[str, BlacklistCheckResponse]):
                 is_blocked=True,
                 blocked_reason=blacklist_entry.blocked_reason,
                 blocked_at=blacklist_entry.created_at,
+                expires_at=blacklist_entry.expires_at,
+                is_stale=is_stale,
             )
         
         return BlacklistCheckResponse(
@@ -23,5 +31,6 @@ class CheckEmailInBlacklistUseCase(BaseUseCase[str, BlacklistCheckResponse]):
             is_blocked=False,
             blocked_reason=None,
             blocked_at=None,
+            is_stale=is_stale,
         )
 
@@ -0,0 +1,40 @@
+from domain.ports import BlacklistRepository
+from domain.schemas import (
+    BlacklistBatchCheckRequest,
+    BlacklistBatchCheckResponse,
+    BlacklistCheckResponse,
+)
+from domain.use_cases.base_use_case import BaseUseCase
+from errors import StaleResultError
+
+
+class CheckEmailsInBlacklistUseCase(BaseUseCase[BlacklistBatchCheckRequest, BlacklistBatchCheckResponse]):
+    def __init__(self, repository: BlacklistRepository):
+        self.repository = repository
+
+    async def execute(self, data: BlacklistBatchCheckRequest) -> BlacklistBatchCheckResponse:
+        emails = list(dict.fromkeys(data.emails))
+        try:
+            entries = await self.repository.get_many_by_email(emails)
+            is_stale = False
+        except StaleResultError as stale:
+            entries = stale.result
+            is_stale = True
+
+        found = {entry.email: entry for entry in entries}
+        results = []
+        for email in data.emails:
+            entry = found.get(email)
+            if entry:
+                results.append(
+                    BlacklistCheckResponse(
+                        email=email,
+                        is_blocked=True,
+                        blocked_reason=entry.blocked_reason,
+                        blocked_at=entry.created_at,
+                        expires_at=entry.expires_at,
+                    )
+                )
+            else:
+                results.append(BlacklistCheckResponse(email=email, is_blocked=False))
+        return BlacklistBatchCheckResponse(results=results, is_stale=is_stale)
@@ -0,0 +1,10 @@
+from domain.ports import BlacklistRepository
+from domain.use_cases.base_use_case import BaseUseCase
+
+
+class PurgeExpiredEntriesUseCase(BaseUseCase[int, int]):
+    def __init__(self, repository: BlacklistRepository):
+        self.repository = repository
+
+    async def execute(self, batch_size: int) -> int:
+        return await self.repository.delete_expired(batch_size)
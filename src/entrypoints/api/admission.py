@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict, deque
+from typing import AsyncGenerator, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+from config import settings
+from entrypoints.api.dependencies import get_client_ip, verify_token
+
+
+class ConcurrencyLimiter:
+    """Caps the number of requests in flight, with a short bounded wait for a slot."""
+
+    def __init__(self, limit: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> bool:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return True
+        if self.queue_timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except BaseException:
+            # The slot may have been handed over right before we were cancelled.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter; in_flight is unchanged.
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+
+class TokenBucketRateLimiter:
+    """Per-key token buckets. Only the most recently used ``max_keys`` buckets are kept.
+
+    A ``rate`` of zero disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str) -> Optional[float]:
+        """Take one token for ``key``.
+
+        Returns None when the request is allowed, otherwise the number of seconds
+        until a token becomes available.
+        """
+        if self.rate <= 0:
+            return None
+
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+
+        retry_after = None
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+concurrency_limiter = ConcurrencyLimiter(
+    limit=settings.admission_max_concurrency,
+    queue_timeout=settings.admission_queue_timeout,
+)
+rate_limiter = TokenBucketRateLimiter(
+    rate=settings.rate_limit_per_second,
+    burst=settings.rate_limit_burst,
+)
+
+
+async def get_rate_limit_key(request: Request, token: str) -> str:
+    """Bucket of an authenticated request: its credential, narrowed to the app it declares.
+
+    Only callers holding a valid token reach this, so an unauthenticated client
+    cannot spend another app's tokens.
+    """
+    identity = hashlib.sha256(token.encode()).hexdigest()[:16]
+    if request.method in ("POST", "PUT", "PATCH"):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and body.get("app_uuid"):
+            return f"{identity}:app:{body['app_uuid']}"
+
+    app_uuid = request.headers.get("X-App-UUID")
+    if app_uuid:
+        return f"{identity}:app:{app_uuid}"
+    return f"{identity}:ip:{get_client_ip(request)}"
+
+
+async def admission_control(
+    request: Request,
+    token: str = Depends(verify_token),
+) -> AsyncGenerator[None, None]:
+    """Rejects work up front instead of letting it queue behind the DB pool.
+
+    Runs after authentication, so requests with a bad token get 401 and are
+    never charged to a rate-limit bucket.
+    """
+    retry_after = rate_limiter.acquire(await get_rate_limit_key(request, token))
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    if not await concurrency_limiter.acquire():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service overloaded, try again later",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        concurrency_limiter.release()
@@ -4,16 +4,29 @@ from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from sqlmodel import SQLModel
 
+from assembly import build_components, purge_expired_entries_use_case
 from config import settings
 from db.session import database
-from entrypoints.api.routers import blacklist_router
+from entrypoints.api.routers import blacklist_router, debug_router
+from entrypoints.background import ExpiredEntriesSweeper
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with database.async_engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    for engine in database.shard_engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+    app.state.components = build_components(database)
+    sweeper = ExpiredEntriesSweeper(
+        purge_expired_entries_use_case,
+        interval=settings.sweeper_interval,
+        batch_size=settings.sweeper_batch_size,
+        batch_pause=settings.sweeper_batch_pause,
+    )
+    if settings.sweeper_interval > 0:
+        sweeper.start()
     yield
+    await sweeper.stop()
     await database.close()
 
 
@@ -39,10 +52,15 @@ app = FastAPI(
             "name": "health",
             "description": "Health check y monitoreo",
         },
+        {
+            "name": "debug",
+            "description": "Diagnóstico de rendimiento: perfilado y consultas lentas",
+        },
     ],
 )
 
 app.include_router(blacklist_router)
+app.include_router(debug_router)
 
 
 @app.get(
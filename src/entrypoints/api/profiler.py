@@ -0,0 +1,38 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(duration: float, interval: float) -> Counter:
+    """Sample every other thread's stack until ``duration`` seconds have passed."""
+    own_thread = threading.get_ident()
+    counts: Counter = Counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            stack = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                stack.append(_frame_label(current))
+                current = current.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+def collapse_stacks(counts: Counter) -> str:
+    """Render samples in the collapsed format read by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
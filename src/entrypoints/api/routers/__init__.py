@@ -1,4 +1,4 @@
 from .blacklist import router as blacklist_router
+from .debug import router as debug_router
 
-__all__ = ["blacklist_router"]
-
+__all__ = ["blacklist_router", "debug_router"]
@@ -1,16 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import math
 
-from assembly import get_add_email_use_case, get_check_email_use_case
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from assembly import (
+    get_add_email_use_case,
+    get_batch_check_email_use_case,
+    get_check_email_use_case,
+)
 from domain.schemas import (
+    BlacklistBatchCheckRequest,
+    BlacklistBatchCheckResponse,
     BlacklistCheckResponse,
     BlacklistCreateRequest,
     BlacklistCreateResponse,
 )
-from domain.use_cases import AddEmailToBlacklistUseCase, CheckEmailInBlacklistUseCase
+from domain.use_cases import (
+    AddEmailToBlacklistUseCase,
+    CheckEmailInBlacklistUseCase,
+    CheckEmailsInBlacklistUseCase,
+)
+from entrypoints.api.admission import admission_control
 from entrypoints.api.dependencies import get_client_ip, verify_token
-from errors import DuplicateEmailError
+from errors import DuplicateEmailError, ServiceUnavailableError
+
+router = APIRouter(
+    prefix="/blacklists",
+    tags=["blacklists"],
+    dependencies=[Depends(admission_control)],
+    responses={
+        429: {
+            "description": "Límite de solicitudes por aplicación excedido",
+            "headers": {"Retry-After": {"description": "Segundos a esperar antes de reintentar"}},
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Rate limit exceeded"}
+                }
+            }
+        },
+        503: {
+            "description": "Servicio saturado, la solicitud fue rechazada sin esperar a la base de datos",
+            "headers": {"Retry-After": {"description": "Segundos a esperar antes de reintentar"}},
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Service overloaded, try again later"}
+                }
+            }
+        },
+    },
+)
+
 
-router = APIRouter(prefix="/blacklists", tags=["blacklists"])
+def service_unavailable(error: ServiceUnavailableError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
 
 
 @router.post(
@@ -100,6 +145,75 @@ async def add_email_to_blacklist(
         )
 
 
+@router.post(
+    "/batch-check",
+    response_model=BlacklistBatchCheckResponse,
+    summary="Consultar varios emails en lista negra",
+    description="""
+    Consulta en una sola solicitud si varios emails están en la lista negra.
+    
+    Cuerpo:
+    - **emails**: Lista de emails a consultar (máximo `BATCH_CHECK_MAX_EMAILS`, 100 por defecto)
+    
+    Notas:
+    - Retorna un resultado por email, en el mismo orden de la solicitud
+    - Cada resultado tiene el mismo formato que `GET /blacklists/{email}`
+    - Requiere autenticación mediante Bearer Token
+    - Si la base de datos no está disponible y todos los emails tienen un último resultado
+      conocido, responde con ellos e incluye el header `X-Data-Stale: true`; si no, responde `503`
+    """,
+    response_description="Estado de cada email en la lista negra",
+    responses={
+        200: {
+            "description": "Consulta exitosa",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "results": [
+                            {
+                                "email": "spam@example.com",
+                                "is_blocked": True,
+                                "blocked_reason": "Usuario reportado por spam",
+                                "blocked_at": "2024-10-19T14:30:00.123456",
+                                "expires_at": None
+                            },
+                            {
+                                "email": "clean@example.com",
+                                "is_blocked": False,
+                                "blocked_reason": None,
+                                "blocked_at": None,
+                                "expires_at": None
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "Token de autenticación inválido o faltante",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Invalid authentication token"}
+                }
+            }
+        }
+    }
+)
+async def check_emails_in_blacklist(
+    data: BlacklistBatchCheckRequest,
+    response: Response,
+    batch_check_email_use_case: CheckEmailsInBlacklistUseCase = Depends(get_batch_check_email_use_case),
+    token: str = Depends(verify_token),
+) -> BlacklistBatchCheckResponse:
+    try:
+        result = await batch_check_email_use_case.execute(data)
+    except ServiceUnavailableError as e:
+        raise service_unavailable(e)
+    if result.is_stale:
+        response.headers["X-Data-Stale"] = "true"
+    return result
+
+
 @router.get(
     "/{email}",
     response_model=BlacklistCheckResponse,
@@ -124,6 +238,8 @@ async def add_email_to_blacklist(
     Notas:
     - Retorna estado 200 si el email está bloqueado o no
     - Requiere autenticación mediante Bearer Token
+    - Si la base de datos no está disponible, responde con el último resultado conocido
+      e incluye el header `X-Data-Stale: true`; si no hay resultado conocido responde `503`
     """,
     response_description="Estado del email en la lista negra",
     responses={
@@ -166,9 +282,15 @@ async def add_email_to_blacklist(
 )
 async def check_email_in_blacklist(
     email: str,
+    response: Response,
     check_email_use_case: CheckEmailInBlacklistUseCase = Depends(get_check_email_use_case),
     token: str = Depends(verify_token),
 ) -> BlacklistCheckResponse:
-    result = await check_email_use_case.execute(email)
+    try:
+        result = await check_email_use_case.execute(email)
+    except ServiceUnavailableError as e:
+        raise service_unavailable(e)
+    if result.is_stale:
+        response.headers["X-Data-Stale"] = "true"
     return result
 
@@ -0,0 +1,61 @@
+import asyncio
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from config import settings
+from db.slow_query import slow_query_log
+from entrypoints.api.dependencies import verify_token
+from entrypoints.api.profiler import collapse_stacks, sample_stacks
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(verify_token)])
+
+_profile_lock = asyncio.Lock()
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    summary="Perfilar el proceso",
+    description="""
+    Ejecuta un profiler por muestreo sobre todos los hilos del proceso durante
+    `seconds` segundos y retorna las pilas en formato colapsado
+    (compatible con flamegraph.pl y speedscope).
+
+    Notas:
+    - Solo se permite un perfilado a la vez
+    - Requiere autenticación mediante Bearer Token
+    """,
+    responses={
+        409: {
+            "description": "Ya hay un perfilado en curso",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "A profiling session is already running"}
+                }
+            }
+        }
+    }
+)
+async def profile(
+    seconds: float = Query(10, gt=0, le=settings.profiler_max_seconds),
+    interval_ms: float = Query(10, ge=1, le=1000),
+) -> PlainTextResponse:
+    if _profile_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profiling session is already running",
+        )
+    async with _profile_lock:
+        counts = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    return PlainTextResponse(collapse_stacks(counts))
+
+
+@router.get(
+    "/slow-queries",
+    summary="Consultas lentas recientes",
+    description="Retorna las últimas consultas que superaron `SLOW_QUERY_THRESHOLD_MS`. Requiere autenticación mediante Bearer Token.",
+)
+async def slow_queries() -> list[dict]:
+    return [asdict(entry) for entry in slow_query_log.recent()]
@@ -0,0 +1,3 @@
+from .expired_entries_sweeper import ExpiredEntriesSweeper
+
+__all__ = ["ExpiredEntriesSweeper"]
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from typing import AsyncContextManager, Callable, Optional
+
+from domain.use_cases import PurgeExpiredEntriesUseCase
+
+logger = logging.getLogger(__name__)
+
+
+class ExpiredEntriesSweeper:
+    """Periodically deletes expired blacklist entries in small batches.
+
+    Every batch runs in its own session and transaction, with a short pause in
+    between, so the sweeper never holds locks for long or starves the pool.
+    """
+
+    def __init__(
+        self,
+        use_case_factory: Callable[[], AsyncContextManager[PurgeExpiredEntriesUseCase]],
+        interval: float,
+        batch_size: int,
+        batch_pause: float = 0.0,
+    ):
+        self.use_case_factory = use_case_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        deleted = 0
+        while True:
+            async with self.use_case_factory() as use_case:
+                batch = await use_case.execute(self.batch_size)
+            deleted += batch
+            if batch < self.batch_size:
+                return deleted
+            await asyncio.sleep(self.batch_pause)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                deleted = await self.run_once()
+                if deleted:
+                    logger.info("Deleted %d expired blacklist entries", deleted)
+            except Exception:
+                logger.exception("Expired entries sweep failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="expired-entries-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,346 @@
+"""Load a large CSV or NDJSON blocklist straight into the blacklists table.
+
+Usage:
+    python -m entrypoints.cli.bulk_load FILE [--app-uuid UUID] [--workers 4] [--checkpoint FILE]
+    python -m entrypoints.cli.bulk_load FILE --dry-run
+
+Every row needs an ``email`` and an ``app_uuid`` (or ``--app-uuid``), and may
+set ``blocked_reason``, ``ip_address``, ``created_at`` and ``expires_at``.
+Rows are validated like ``POST /blacklists`` bodies; invalid rows are
+reported and skipped. Emails that are already blocked are left untouched.
+
+The file is split into fixed-size chunks. Chunks are validated in parallel in
+a pool of ``--workers`` processes, off the event loop, and up to ``--workers``
+chunks are written at once. On Postgres each chunk is COPYed into a temporary
+staging table and merged with
+``INSERT ... SELECT DISTINCT ON (email) ... ON CONFLICT DO NOTHING``. SQLite
+allows a single writer, so there chunks go through the database's write queue
+one after the other, like the API's writes. Completed chunks are recorded in
+the checkpoint file, so an interrupted load resumes where it stopped when run
+again with the same file and chunk size.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional, Sequence
+
+from pydantic import ValidationError
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from adapters.models import Blacklist
+from adapters.repositories import shard_for
+from db.session import Database
+from db.sqlite import SQLiteWriteQueue
+from db.statements import insert_ignoring_duplicates
+from domain.schemas import BlacklistCreateRequest
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("email", "app_uuid", "blocked_reason", "ip_address", "created_at", "expires_at")
+STAGING_TABLE = "blacklists_staging"
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class BulkLoadReport:
+    rows: int = 0
+    valid: int = 0
+    invalid: int = 0
+    inserted: int = 0
+    already_blocked: int = 0
+    chunks_loaded: int = 0
+    chunks_skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class Checkpoint:
+    """Indexes of the chunks already loaded, persisted after every chunk."""
+
+    def __init__(self, path: Optional[str], source: str, chunk_size: int):
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.chunk_size = chunk_size
+        self.completed: set[int] = set()
+        if path and os.path.exists(path):
+            with open(path) as checkpoint_file:
+                data = json.load(checkpoint_file)
+            if data["source"] != self.source or data["chunk_size"] != chunk_size:
+                raise ValueError(
+                    f"Checkpoint {path} was written for {data['source']} with chunk size "
+                    f"{data['chunk_size']}; use the same file and --chunk-size, or another checkpoint"
+                )
+            self.completed = set(data["completed_chunks"])
+
+    def mark_done(self, index: int) -> None:
+        self.completed.add(index)
+        if not self.path:
+            return
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump(
+                {
+                    "source": self.source,
+                    "chunk_size": self.chunk_size,
+                    "completed_chunks": sorted(self.completed),
+                },
+                checkpoint_file,
+            )
+        os.replace(temporary_path, self.path)
+
+
+def detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def read_records(path: str, file_format: str) -> Iterator[dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8") as source:
+        if file_format == "csv":
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunked(records: Iterator[dict[str, Any]], size: int) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+    chunk: list[dict[str, Any]] = []
+    index = 0
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield index, chunk
+            chunk, index = [], index + 1
+    if chunk:
+        yield index, chunk
+
+
+def _utc_naive(value: Any) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def validate_record(record: dict[str, Any], app_uuid: Optional[str], ip_address: str) -> dict[str, Any]:
+    """Validate one input row like a POST /blacklists body and return the row to insert."""
+    values = {key: value for key, value in record.items() if key and value not in (None, "")}
+    values.setdefault("app_uuid", app_uuid)
+    data = BlacklistCreateRequest.model_validate(values)
+    return {
+        "email": data.email,
+        "app_uuid": data.app_uuid,
+        "blocked_reason": data.blocked_reason,
+        "ip_address": str(values.get("ip_address", ip_address)),
+        "created_at": _utc_naive(values.get("created_at")) or datetime.utcnow(),
+        "expires_at": data.expires_at,
+    }
+
+
+def validate_chunk(
+    index: int,
+    chunk: list[dict[str, Any]],
+    chunk_size: int,
+    app_uuid: Optional[str],
+    ip_address: str,
+) -> tuple[list[dict[str, Any]], int, list[str]]:
+    """Valid rows of a chunk, how many were invalid, and the first errors; runs in a worker process."""
+    valid, invalid, errors = [], 0, []
+    for offset, record in enumerate(chunk):
+        try:
+            valid.append(validate_record(record, app_uuid, ip_address))
+        except (ValidationError, ValueError, TypeError) as error:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                message = "; ".join(
+                    item["msg"] for item in error.errors()
+                ) if isinstance(error, ValidationError) else str(error)
+                errors.append(f"row {index * chunk_size + offset + 1}: {message}")
+    return valid, invalid, errors
+
+
+async def _copy_and_merge(engine: AsyncEngine, rows: list[dict[str, Any]]) -> int:
+    table = Blacklist.__tablename__
+    columns = ", ".join(COLUMNS)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} "
+            "(email varchar NOT NULL, app_uuid uuid NOT NULL, blocked_reason varchar(255), "
+            "ip_address varchar NOT NULL, created_at timestamp NOT NULL, expires_at timestamp) "
+            "ON COMMIT DROP"
+        )
+        raw_connection = await conn.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            STAGING_TABLE,
+            records=[tuple(row[column] for column in COLUMNS) for row in rows],
+            columns=list(COLUMNS),
+        )
+        # Expired entries do not block a new one, as in the API.
+        await conn.execute(
+            text(
+                f"DELETE FROM {table} USING {STAGING_TABLE} "
+                f"WHERE {table}.email = {STAGING_TABLE}.email AND {table}.expires_at <= :now"
+            ),
+            {"now": datetime.utcnow()},
+        )
+        result = await conn.execute(
+            text(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT DISTINCT ON (email) {columns} FROM {STAGING_TABLE} ORDER BY email, created_at "
+                "ON CONFLICT (email) DO NOTHING"
+            )
+        )
+        return result.rowcount
+
+
+async def _insert_ignoring_duplicates(conn: AsyncConnection, rows: list[dict[str, Any]]) -> int:
+    table = Blacklist.__table__
+    await conn.execute(
+        delete(table).where(
+            table.c.email.in_([row["email"] for row in rows]),
+            table.c.expires_at <= datetime.utcnow(),
+        )
+    )
+    statement = insert_ignoring_duplicates(conn.dialect.name, table, ["email"])
+    result = await conn.execute(statement, rows)
+    return result.rowcount
+
+
+async def load_rows(
+    engine: AsyncEngine, rows: list[dict[str, Any]], write_queue: Optional[SQLiteWriteQueue] = None
+) -> int:
+    """Insert ``rows`` into one database, skipping emails already blocked; returns rows inserted."""
+    if engine.dialect.name == "postgresql":
+        return await _copy_and_merge(engine, rows)
+    # No COPY outside Postgres: fall back to plain inserts (used by SQLite deployments and tests).
+    if write_queue is not None:
+        async def write(session: AsyncSession) -> int:
+            return await _insert_ignoring_duplicates(await session.connection(), rows)
+
+        return await write_queue.submit(write)
+    async with engine.begin() as conn:
+        return await _insert_ignoring_duplicates(conn, rows)
+
+
+async def bulk_load(
+    database: Database,
+    path: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = 10_000,
+    workers: int = 4,
+    checkpoint_path: Optional[str] = None,
+    dry_run: bool = False,
+    app_uuid: Optional[str] = None,
+    ip_address: str = "0.0.0.0",
+) -> BulkLoadReport:
+    report = BulkLoadReport()
+    checkpoint = Checkpoint(None if dry_run else checkpoint_path, path, chunk_size)
+    records = read_records(path, file_format or detect_format(path))
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    loop = asyncio.get_running_loop()
+    validators = ProcessPoolExecutor(max_workers=workers)
+
+    async def validate(index: int, chunk: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # Validation is CPU-bound: in the event loop it would serialize the workers.
+        valid, invalid, errors = await loop.run_in_executor(
+            validators, validate_chunk, index, chunk, chunk_size, app_uuid, ip_address
+        )
+        report.rows += len(chunk)
+        report.valid += len(valid)
+        report.invalid += invalid
+        report.errors.extend(errors[: MAX_REPORTED_ERRORS - len(report.errors)])
+        return valid
+
+    async def produce() -> None:
+        for index, chunk in chunked(records, chunk_size):
+            if index in checkpoint.completed:
+                report.chunks_skipped += 1
+                continue
+            await queue.put((index, chunk))
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work() -> None:
+        while (item := await queue.get()) is not None:
+            index, chunk = item
+            rows = await validate(index, chunk)
+            if not dry_run:
+                by_shard: dict[int, list[dict[str, Any]]] = defaultdict(list)
+                for row in rows:
+                    by_shard[shard_for(row["email"], len(database.shard_urls))].append(row)
+                for shard, shard_rows in by_shard.items():
+                    inserted = await load_rows(
+                        database.shard_engines[shard], shard_rows, database.write_queue_for(shard)
+                    )
+                    report.inserted += inserted
+                    report.already_blocked += len(shard_rows) - inserted
+                checkpoint.mark_done(index)
+            report.chunks_loaded += 1
+            logger.info("chunk %d done: %d rows read, %d inserted", index, report.rows, report.inserted)
+
+    try:
+        async with asyncio.TaskGroup() as tasks:
+            tasks.create_task(produce())
+            for _ in range(max(1, workers)):
+                tasks.create_task(work())
+    finally:
+        validators.shutdown(cancel_futures=True)
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or NDJSON file to load")
+    parser.add_argument("--format", dest="file_format", choices=["csv", "ndjson"], help="Default: from the extension")
+    parser.add_argument("--app-uuid", help="app_uuid for rows that do not have one")
+    parser.add_argument("--ip-address", default="0.0.0.0", help="ip_address for rows that do not have one")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Validation processes and chunks written at once (SQLite: one writer)"
+    )
+    parser.add_argument("--checkpoint", help="Progress file used to resume an interrupted load")
+    parser.add_argument("--dry-run", action="store_true", help="Only validate the file; nothing is written")
+    parser.add_argument("--database-url", help="Default: the API's database configuration")
+    args = parser.parse_args(argv)
+    if args.chunk_size <= 0 or args.workers <= 0:
+        parser.error("--chunk-size and --workers must be positive")
+    return args
+
+
+async def main(argv: Optional[Sequence[str]] = None) -> BulkLoadReport:
+    args = parse_args(argv)
+    database = Database(args.database_url, shard_urls=[]) if args.database_url else Database()
+    try:
+        if not args.dry_run:
+            for engine in database.shard_engines:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Blacklist.metadata.create_all)
+        return await bulk_load(
+            database,
+            args.path,
+            file_format=args.file_format,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            dry_run=args.dry_run,
+            app_uuid=args.app_uuid,
+            ip_address=args.ip_address,
+        )
+    finally:
+        await database.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(asdict(asyncio.run(main()))))
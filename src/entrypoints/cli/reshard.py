@@ -0,0 +1,241 @@
+"""Move blacklist rows to the shard that owns them under a new shard layout.
+
+Usage:
+    python -m entrypoints.cli.reshard --from URL [URL ...] --to URL [URL ...] [--delete-source]
+
+Rows are first copied to their new shard, skipping emails already there, so an
+interrupted run can simply be started again. With ``--delete-source`` the copy
+is then verified: for every new shard, the rows that old shards hold for it
+are counted and must all be present in it. Moved rows are deleted from their
+old shard only when every shard matches. Writes must be stopped for the whole run; rows
+written to an old shard after the copy make the check fail instead of being lost.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from adapters.models import Blacklist
+from adapters.repositories import shard_for
+from db.session import Database
+from db.sqlite import is_memory_url
+from db.statements import insert_ignoring_duplicates
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReshardReport:
+    scanned: int = 0
+    moved: int = 0
+    deleted: int = 0
+    expected_per_shard: list[int] = field(default_factory=list)
+    copied_per_shard: list[int] = field(default_factory=list)
+
+
+class ReshardVerificationError(Exception):
+    """The new shards do not hold every row the old ones do; nothing was deleted."""
+
+    def __init__(self, report: ReshardReport):
+        super().__init__(
+            f"Row counts per new shard do not match: expected {report.expected_per_shard}, "
+            f"found {report.copied_per_shard}. Stop writes and run again before deleting."
+        )
+        self.report = report
+
+
+DEFAULT_PORTS = {"postgresql": 5432, "mysql": 3306}
+
+
+def database_identity(url: str) -> tuple:
+    """What a URL points at, whatever the driver or spelling: backend, host, port and database."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        # Every in-memory URL is a database of its own.
+        return (backend, url) if is_memory_url(url) else (backend, os.path.realpath(parsed.database))
+    return (
+        backend,
+        (parsed.host or "localhost").lower(),
+        parsed.port or DEFAULT_PORTS.get(backend),
+        parsed.database,
+    )
+
+
+def check_layout(source_urls: Sequence[str], target_urls: Sequence[str]) -> None:
+    """Refuse layouts where one database could be taken for two shards, or two shards for one database."""
+    for name, urls in (("--from", source_urls), ("--to", target_urls)):
+        identities = [database_identity(url) for url in urls]
+        if len(set(identities)) != len(identities):
+            raise ValueError(f"{name} lists the same database more than once: {list(urls)}")
+    sources = {database_identity(url): url for url in source_urls}
+    for url in target_urls:
+        source_url = sources.get(database_identity(url))
+        if source_url is not None and source_url != url:
+            raise ValueError(
+                f"Target {url} is the source database {source_url} spelled differently; use the same URL for both"
+            )
+
+
+async def _batches(
+    engine: AsyncEngine, batch_size: int, max_id: Optional[int] = None
+) -> AsyncIterator[list[dict]]:
+    table = Blacklist.__table__
+    last_id = 0
+    while True:
+        statement = select(table).where(table.c.id > last_id).order_by(table.c.id).limit(batch_size)
+        if max_id is not None:
+            statement = statement.where(table.c.id <= max_id)
+        async with engine.connect() as conn:
+            rows = (await conn.execute(statement)).mappings().all()
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        yield rows
+
+
+async def verify_copy(source: Database, target: Database, batch_size: int) -> tuple[list[int], list[int]]:
+    """Per new shard: rows held for it by other old shards, and how many of those it has."""
+    table = Blacklist.__table__
+    target_count = len(target.shard_urls)
+    target_ids = [database_identity(url) for url in target.shard_urls]
+    expected = [0] * target_count
+    copied = [0] * target_count
+    for source_url, source_engine in zip(source.shard_urls, source.shard_engines):
+        source_id = database_identity(source_url)
+        # Every current row, not just the copy's snapshot, so rows written since then are caught.
+        async for rows in _batches(source_engine, batch_size):
+            emails = defaultdict(list)
+            for row in rows:
+                index = shard_for(row["email"], target_count)
+                if target_ids[index] != source_id:
+                    emails[index].append(row["email"])
+            for index, batch in emails.items():
+                expected[index] += len(batch)
+                async with target.shard_engines[index].connect() as conn:
+                    copied[index] += await conn.scalar(
+                        select(func.count()).select_from(table).where(table.c.email.in_(batch))
+                    )
+    return expected, copied
+
+
+async def reshard(
+    source: Database,
+    target: Database,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    delete_source: bool = False,
+) -> ReshardReport:
+    check_layout(source.shard_urls, target.shard_urls)
+    table = Blacklist.__table__
+    report = ReshardReport()
+    target_count = len(target.shard_urls)
+    target_ids = [database_identity(url) for url in target.shard_urls]
+
+    # Rows copied into a shard that is also a source must not be scanned again.
+    max_ids = []
+    for source_engine in source.shard_engines:
+        async with source_engine.connect() as conn:
+            max_ids.append(await conn.scalar(select(func.max(table.c.id))) or 0)
+
+    for source_url, source_engine, max_id in zip(source.shard_urls, source.shard_engines, max_ids):
+        source_id = database_identity(source_url)
+        async for rows in _batches(source_engine, batch_size, max_id):
+            report.scanned += len(rows)
+
+            moves = defaultdict(list)
+            for row in rows:
+                index = shard_for(row["email"], target_count)
+                if target_ids[index] != source_id:
+                    moves[index].append(row)
+
+            for index, batch in moves.items():
+                report.moved += len(batch)
+                if dry_run:
+                    continue
+                async with target.shard_engines[index].begin() as conn:
+                    statement = insert_ignoring_duplicates(conn.dialect.name, table, ["email"])
+                    await conn.execute(
+                        statement,
+                        [{key: value for key, value in row.items() if key != "id"} for row in batch],
+                    )
+
+            logger.info("%s: copied up to id %d (%s)", source_url, rows[-1]["id"], report)
+
+    if dry_run or not delete_source:
+        return report
+
+    report.expected_per_shard, report.copied_per_shard = await verify_copy(source, target, batch_size)
+    if report.expected_per_shard != report.copied_per_shard:
+        raise ReshardVerificationError(report)
+
+    for source_url, source_engine, max_id in zip(source.shard_urls, source.shard_engines, max_ids):
+        source_id = database_identity(source_url)
+        async for rows in _batches(source_engine, batch_size, max_id):
+            moved_ids = [
+                row["id"]
+                for row in rows
+                if target_ids[shard_for(row["email"], target_count)] != source_id
+            ]
+            if moved_ids:
+                async with source_engine.begin() as conn:
+                    await conn.execute(delete(table).where(table.c.id.in_(moved_ids)))
+                report.deleted += len(moved_ids)
+        logger.info("%s: deleted moved rows (%s)", source_url, report)
+
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from", dest="source_urls", nargs="+", required=True, help="Current shard URLs, in order")
+    parser.add_argument("--to", dest="target_urls", nargs="+", required=True, help="New shard URLs, in order")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would move")
+    parser.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="Delete moved rows from their old shard once the row counts per new shard match",
+    )
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[Sequence[str]] = None) -> ReshardReport:
+    args = parse_args(argv)
+    source = Database(shard_urls=args.source_urls)
+    target = Database(shard_urls=args.target_urls)
+    try:
+        if not args.dry_run:
+            for engine in target.shard_engines:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Blacklist.metadata.create_all)
+        return await reshard(
+            source,
+            target,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            delete_source=args.delete_source,
+        )
+    finally:
+        await source.close()
+        await target.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        print(json.dumps(asdict(asyncio.run(main()))))
+    except ReshardVerificationError as error:
+        print(json.dumps(asdict(error.report)))
+        sys.exit(f"error: {error}")
+    except ValueError as error:
+        sys.exit(f"error: {error}")
@@ -1,3 +1,6 @@
+from typing import Any
+
+
 class DuplicateEmailError(Exception):
     pass
 
@@ -5,3 +8,20 @@ class DuplicateEmailError(Exception):
 class UnauthorizedError(Exception):
     pass
 
+
+class ServiceUnavailableError(Exception):
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ServiceUnavailableError):
+    pass
+
+
+class StaleResultError(Exception):
+    """The fresh value could not be read; ``result`` is the last known one."""
+
+    def __init__(self, result: Any):
+        super().__init__("Serving last known result")
+        self.result = result
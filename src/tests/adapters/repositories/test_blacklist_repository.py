@@ -0,0 +1,102 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import assembly
+from adapters.repositories import SQLModelBlacklistRepository
+from domain.use_cases import PurgeExpiredEntriesUseCase
+from entrypoints.background import ExpiredEntriesSweeper
+from errors import DuplicateEmailError
+
+
+async def add(repository: SQLModelBlacklistRepository, email: str, expires_at=None):
+    return await repository.add_email(
+        email=email,
+        app_uuid=uuid4(),
+        blocked_reason="spam",
+        ip_address="127.0.0.1",
+        expires_at=expires_at,
+    )
+
+
+class TestSQLModelBlacklistRepositoryExpiry:
+    """Tests for expiring entries against a SQLite stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_not_blocked(self, session: AsyncSession):
+        """Test lookups ignore entries whose expires_at has passed."""
+        repository = SQLModelBlacklistRepository(session)
+        await add(repository, "expired@example.com", datetime.utcnow() - timedelta(seconds=1))
+        await add(repository, "active@example.com", datetime.utcnow() + timedelta(days=90))
+        await add(repository, "forever@example.com")
+
+        assert await repository.get_by_email("expired@example.com") is None
+        assert await repository.email_exists("active@example.com") is True
+        assert await repository.email_exists("forever@example.com") is True
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_can_be_blocked_again(self, session: AsyncSession):
+        """Test an unswept expired row does not make a new block violate the unique email."""
+        repository = SQLModelBlacklistRepository(session)
+        await add(repository, "again@example.com", datetime.utcnow() - timedelta(seconds=1))
+
+        entry = await add(repository, "again@example.com")
+
+        assert (await repository.get_by_email("again@example.com")).id == entry.id
+
+    @pytest.mark.asyncio
+    async def test_duplicate_insert_raises_domain_error(self, session: AsyncSession):
+        """Test a unique-email violation surfaces as DuplicateEmailError and leaves the session usable."""
+        repository = SQLModelBlacklistRepository(session)
+        await add(repository, "dup@example.com")
+
+        with pytest.raises(DuplicateEmailError):
+            await add(repository, "dup@example.com")
+        assert await repository.email_exists("dup@example.com") is True
+
+    @pytest.mark.asyncio
+    async def test_sweeper_deletes_expired_entries_in_batches(self, session: AsyncSession):
+        """Test the sweeper removes every expired entry, batch by batch, and nothing else."""
+        repository = SQLModelBlacklistRepository(session)
+        past = datetime.utcnow() - timedelta(minutes=1)
+        for i in range(5):
+            await add(repository, f"expired{i}@example.com", past)
+        await add(repository, "active@example.com", datetime.utcnow() + timedelta(days=1))
+
+        batches = []
+
+        @asynccontextmanager
+        async def use_case_factory():
+            use_case = PurgeExpiredEntriesUseCase(repository)
+            yield use_case
+            batches.append(1)
+
+        sweeper = ExpiredEntriesSweeper(use_case_factory, interval=60, batch_size=2)
+
+        assert await sweeper.run_once() == 5
+        assert len(batches) == 3
+        assert await repository.delete_expired(10) == 0
+        assert await repository.email_exists("active@example.com") is True
+
+    @pytest.mark.asyncio
+    async def test_purge_use_case_closes_sessions_when_the_block_fails(self, monkeypatch):
+        """Test the sweeper's sessions are closed as soon as its block raises, not at garbage collection."""
+        closed = []
+
+        async def get_shard_sessions():
+            try:
+                yield []
+            finally:
+                closed.append(True)
+
+        monkeypatch.setattr(assembly, "get_shard_sessions", get_shard_sessions)
+        monkeypatch.setattr(assembly, "get_blacklist_repository", lambda sessions: None)
+
+        with pytest.raises(RuntimeError):
+            async with assembly.purge_expired_entries_use_case():
+                raise RuntimeError("sweep failed")
+
+        assert closed == [True]
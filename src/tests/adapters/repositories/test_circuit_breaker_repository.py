@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import assembly
+
+from adapters.models import Blacklist
+from adapters.repositories import (
+    CircuitBreaker,
+    CircuitBreakerBlacklistRepository,
+    LastKnownResults,
+    shard_for,
+)
+from adapters.repositories.circuit_breaker_repository import CircuitState
+from domain.ports import BlacklistRepository
+from domain.use_cases import CheckEmailInBlacklistUseCase
+from config import settings
+from errors import CircuitOpenError, ServiceUnavailableError, StaleResultError
+
+
+def make_entry(email: str) -> Blacklist:
+    return Blacklist(
+        id=1,
+        email=email,
+        app_uuid=uuid4(),
+        blocked_reason="spam",
+        ip_address="127.0.0.1",
+        created_at=datetime(2024, 10, 19, 14, 30),
+    )
+
+
+class TestCircuitBreaker:
+    """Unit tests for the circuit breaker state machine."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_fails_fast(self):
+        """Test the circuit opens after consecutive failures and stops calling through."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60, call_timeout=1)
+        failing = AsyncMock(side_effect=ConnectionError("db down"))
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await breaker.call(failing)
+
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(failing)
+        assert failing.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deadline_counts_as_failure(self):
+        """Test a call exceeding its deadline is cancelled and recorded as a failure."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, call_timeout=0.01)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(slow)
+        assert breaker.state is CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_programming_errors_do_not_open_the_circuit(self):
+        """Test exceptions other than storage failures propagate without counting as failures."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60, call_timeout=1)
+        buggy = AsyncMock(side_effect=TypeError("bad argument"))
+
+        for _ in range(5):
+            with pytest.raises(TypeError):
+                await breaker.call(buggy)
+
+        assert breaker.state is CircuitState.CLOSED
+        assert buggy.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes_circuit_on_success(self):
+        """Test a successful probe after the reset timeout closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, call_timeout=1)
+        with pytest.raises(ConnectionError):
+            await breaker.call(AsyncMock(side_effect=ConnectionError()))
+
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert await breaker.call(AsyncMock(return_value="ok")) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+
+class TestCircuitBreakerBlacklistRepository:
+    """Unit tests for stale-serve behaviour of the guarded repository."""
+
+    def make_repository(self, inner: BlacklistRepository) -> CircuitBreakerBlacklistRepository:
+        return CircuitBreakerBlacklistRepository(
+            inner,
+            CircuitBreaker(failure_threshold=1, reset_timeout=60, call_timeout=1),
+            LastKnownResults(max_size=10, max_age=60),
+        )
+
+    @pytest.mark.asyncio
+    async def test_serves_last_known_result_when_storage_fails(self):
+        """Test a lookup falls back to the last known result once the DB fails."""
+        entry = make_entry("spam@example.com")
+        inner = Mock(spec=BlacklistRepository)
+        inner.get_by_email = AsyncMock(side_effect=[entry, ConnectionError("db down")])
+        repository = self.make_repository(inner)
+
+        assert await repository.get_by_email("spam@example.com") is entry
+        with pytest.raises(StaleResultError) as stale:
+            await repository.get_by_email("spam@example.com")
+        assert stale.value.result is entry
+
+    @pytest.mark.asyncio
+    async def test_programming_errors_are_not_hidden_by_stale_results(self, caplog):
+        """Test only storage failures fall back to the last known result, and the fallback is logged."""
+        entry = make_entry("spam@example.com")
+        inner = Mock(spec=BlacklistRepository)
+        inner.get_by_email = AsyncMock(
+            side_effect=[
+                entry,
+                TypeError("bad argument"),
+                TypeError("bad argument"),
+                OperationalError("SELECT", {}, Exception("gone")),
+            ]
+        )
+        repository = self.make_repository(inner)
+
+        await repository.get_by_email("spam@example.com")
+        for _ in range(2):
+            with pytest.raises(TypeError):
+                await repository.get_by_email("spam@example.com")
+        with caplog.at_level(logging.WARNING), pytest.raises(StaleResultError):
+            await repository.get_by_email("spam@example.com")
+        assert "serving the last known result" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_fails_fast_without_last_known_result(self):
+        """Test an open circuit with no cached answer raises ServiceUnavailableError."""
+        inner = Mock(spec=BlacklistRepository)
+        inner.get_by_email = AsyncMock(side_effect=ConnectionError("db down"))
+        repository = self.make_repository(inner)
+
+        with pytest.raises(ServiceUnavailableError):
+            await repository.get_by_email("new@example.com")
+        with pytest.raises(ServiceUnavailableError) as error:
+            await repository.get_by_email("new@example.com")
+        assert error.value.retry_after > 0
+        inner.get_by_email.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_use_case_marks_stale_response(self):
+        """Test the check use case flags answers served from last known results."""
+        inner = Mock(spec=BlacklistRepository)
+        inner.get_by_email = AsyncMock(side_effect=[None, ConnectionError("db down")])
+        use_case = CheckEmailInBlacklistUseCase(self.make_repository(inner))
+
+        fresh = await use_case.execute("clean@example.com")
+        stale = await use_case.execute("clean@example.com")
+
+        assert fresh.is_stale is False
+        assert stale.is_stale is True
+        assert stale.is_blocked is False
+
+    @pytest.mark.asyncio
+    async def test_batch_lookup_serves_stale_only_when_every_email_is_known(self):
+        """Test batch lookups fall back to last known results only if none are missing."""
+        entry = make_entry("spam@example.com")
+        inner = Mock(spec=BlacklistRepository)
+        inner.get_many_by_email = AsyncMock(
+            side_effect=[[entry], ConnectionError("db down"), ConnectionError("db down")]
+        )
+        repository = self.make_repository(inner)
+
+        await repository.get_many_by_email(["spam@example.com", "clean@example.com"])
+        with pytest.raises(StaleResultError) as stale:
+            await repository.get_many_by_email(["spam@example.com", "clean@example.com"])
+        assert stale.value.result == [entry]
+        with pytest.raises(ServiceUnavailableError):
+            await repository.get_many_by_email(["spam@example.com", "new@example.com"])
+
+
+class TestPerShardCircuitBreakers:
+    """Tests for the lookup wiring giving every shard its own circuit breaker."""
+
+    @pytest.mark.asyncio
+    async def test_outage_of_one_shard_does_not_block_the_others(self, make_database, monkeypatch):
+        """Test lookups on shard 0 keep answering while shard 1 is down and its circuit is open."""
+        monkeypatch.setattr(assembly, "_lookup_guards", {})
+        database = await make_database(shards=2, name="shard")
+        healthy_email = next(f"user{i}@example.com" for i in range(100) if shard_for(f"user{i}@example.com", 2) == 0)
+        down_email = next(f"user{i}@example.com" for i in range(100) if shard_for(f"user{i}@example.com", 2) == 1)
+        broken_session = Mock(spec=AsyncSession)
+        broken_session.execute = AsyncMock(side_effect=OperationalError("SELECT", {}, Exception("shard down")))
+
+        async for sessions in database.get_shard_sessions():
+            repository = assembly._blacklist_repository(database, [sessions[0], broken_session], guarded=True)
+            for _ in range(settings.circuit_failure_threshold + 1):
+                with pytest.raises(ServiceUnavailableError):
+                    await repository.get_by_email(down_email)
+
+            assert assembly.lookup_guard(1, 2)[0].state is CircuitState.OPEN
+            assert assembly.lookup_guard(0, 2)[0].state is CircuitState.CLOSED
+            assert await repository.get_by_email(healthy_email) is None
@@ -0,0 +1,107 @@
+import asyncio
+from collections import Counter
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from adapters.repositories import (
+    ShardedBlacklistRepository,
+    SQLModelBlacklistRepository,
+    shard_for,
+)
+from db.session import Database
+from domain.ports import BlacklistRepository
+from errors import StaleResultError
+
+
+@pytest_asyncio.fixture
+async def sharded_database(make_database) -> Database:
+    """Three SQLite files standing in for three Postgres shards."""
+    return await make_database(shards=3, name="shard")
+
+
+class TestShardFor:
+    """Unit tests for the shard routing hash."""
+
+    def test_is_stable_and_normalized(self):
+        """Test routing ignores case and surrounding whitespace and never changes between runs."""
+        assert shard_for("Spam@Example.com ", 8) == shard_for("spam@example.com", 8)
+        assert shard_for("spam@example.com", 8) == 2
+
+    def test_spreads_emails_across_shards(self):
+        """Test emails are spread roughly evenly across shards."""
+        counts = Counter(shard_for(f"user{i}@example.com", 4) for i in range(4000))
+
+        assert set(counts) == {0, 1, 2, 3}
+        assert min(counts.values()) > 800
+
+
+class TestShardedBlacklistRepository:
+    """Tests for the sharded repository against several SQLite databases."""
+
+    @pytest.mark.asyncio
+    async def test_routes_writes_and_reads_to_owning_shard(self, sharded_database: Database):
+        """Test each email is stored only on its shard and read back from it."""
+        emails = [f"user{i}@example.com" for i in range(12)]
+        async for sessions in sharded_database.get_shard_sessions():
+            repository = ShardedBlacklistRepository([SQLModelBlacklistRepository(s) for s in sessions])
+            for email in emails:
+                await repository.add_email(email, uuid4(), None, "127.0.0.1")
+
+            for email in emails:
+                assert (await repository.get_by_email(email)).email == email
+                owner = shard_for(email, 3)
+                for index, shard in enumerate(repository.shards):
+                    assert (await shard.email_exists(email)) is (index == owner)
+
+    @pytest.mark.asyncio
+    async def test_get_many_fans_out_to_all_shards(self, sharded_database: Database):
+        """Test batch lookups gather results from every shard involved."""
+        emails = [f"user{i}@example.com" for i in range(12)]
+        async for sessions in sharded_database.get_shard_sessions():
+            repository = ShardedBlacklistRepository([SQLModelBlacklistRepository(s) for s in sessions])
+            for email in emails[:6]:
+                await repository.add_email(email, uuid4(), None, "127.0.0.1")
+
+            entries = await repository.get_many_by_email(emails)
+
+        assert sorted(entry.email for entry in entries) == sorted(emails[:6])
+        assert len({shard_for(email, 3) for email in emails[:6]}) > 1
+
+    @pytest.mark.asyncio
+    async def test_failing_shard_does_not_orphan_the_others(self):
+        """Test a batch lookup raises a shard's error only after every other shard has finished."""
+        finished = []
+
+        async def slow_lookup(emails):
+            await asyncio.sleep(0.01)
+            finished.append(emails)
+            return []
+
+        healthy = Mock(spec=BlacklistRepository)
+        healthy.get_many_by_email = AsyncMock(side_effect=slow_lookup)
+        failing = Mock(spec=BlacklistRepository)
+        failing.get_many_by_email = AsyncMock(side_effect=ConnectionError("shard down"))
+        repository = ShardedBlacklistRepository([healthy, failing])
+        emails = [f"user{i}@example.com" for i in range(12)]
+
+        with pytest.raises(ConnectionError):
+            await repository.get_many_by_email(emails)
+
+        assert finished == [[email for email in emails if shard_for(email, 2) == 0]]
+
+    @pytest.mark.asyncio
+    async def test_stale_shard_makes_the_batch_answer_stale(self):
+        """Test a shard answering from last known results is merged with fresh shards into one stale answer."""
+        fresh = Mock(spec=BlacklistRepository)
+        fresh.get_many_by_email = AsyncMock(return_value=["fresh-entry"])
+        stale = Mock(spec=BlacklistRepository)
+        stale.get_many_by_email = AsyncMock(side_effect=StaleResultError(["stale-entry"]))
+        repository = ShardedBlacklistRepository([fresh, stale])
+
+        with pytest.raises(StaleResultError) as error:
+            await repository.get_many_by_email([f"user{i}@example.com" for i in range(12)])
+
+        assert sorted(error.value.result) == ["fresh-entry", "stale-entry"]
@@ -0,0 +1,234 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport
+
+from assembly import build_components
+from client import (
+    BlacklistCheckResponse,
+    BlacklistClient,
+    DuplicateEmailError,
+    RateLimitedError,
+    ServiceUnavailableError,
+    TTLCache,
+)
+from config import settings
+from entrypoints.api.main import app
+
+APP_UUID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+class CountingTransport(ASGITransport):
+    """ASGI transport that records the method and path of every request."""
+
+    def __init__(self, app):
+        super().__init__(app=app)
+        self.requests: list[tuple[str, str]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        return await super().handle_async_request(request)
+
+
+def make_client(transport: httpx.AsyncBaseTransport, **kwargs) -> BlacklistClient:
+    return BlacklistClient("http://test", settings.auth_token, transport=transport, **kwargs)
+
+
+def check_body(email: str, is_blocked: bool = False, **extra) -> dict:
+    return {"email": email, "is_blocked": is_blocked, "blocked_reason": None, "blocked_at": None, **extra}
+
+
+@pytest_asyncio.fixture
+async def api(make_database):
+    """The real app wired to a throwaway SQLite database."""
+    app.state.components = build_components(await make_database())
+    try:
+        yield CountingTransport(app)
+    finally:
+        del app.state.components
+
+
+class TestBlacklistClient:
+    """Tests for the async API client."""
+
+    @pytest.mark.asyncio
+    async def test_add_and_check_email_against_app(self, api):
+        """Test a lookup reflects an email added through the client."""
+        async with make_client(api) as client:
+            assert (await client.check_email("spam@example.com")).is_blocked is False
+
+            created = await client.add_email("spam@example.com", APP_UUID, "spam")
+            result = await client.check_email("spam@example.com")
+
+            assert created.email == "spam@example.com"
+            assert result.is_blocked is True
+            assert result.blocked_reason == "spam"
+            with pytest.raises(DuplicateEmailError):
+                await client.add_email("spam@example.com", APP_UUID)
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookups_are_served_from_cache(self, api):
+        """Test a second lookup of the same email does not reach the server."""
+        async with make_client(api) as client:
+            await client.add_email("spam@example.com", APP_UUID)
+            await client.check_email("spam@example.com")
+            await client.check_email("spam@example.com")
+
+        lookups = [request for request in api.requests if request[0] == "GET"]
+        assert lookups == [("GET", "/blacklists/spam@example.com")]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_are_batched(self, api):
+        """Test concurrent lookups become one batch-check request."""
+        async with make_client(api, batch_window=0.01) as client:
+            await client.add_email("spam@example.com", APP_UUID, "spam")
+            results = await asyncio.gather(
+                client.check_email("spam@example.com"),
+                client.check_email("clean@example.com"),
+                client.check_email("spam@example.com"),
+            )
+
+        assert [result.is_blocked for result in results] == [True, False, True]
+        assert api.requests[1:] == [("POST", "/blacklists/batch-check")]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_single_lookups_without_batch_endpoint(self):
+        """Test a server without batch-check is queried with one GET per email."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append((request.method, request.url.path))
+            if request.url.path == "/blacklists/batch-check":
+                return httpx.Response(405, json={"detail": "Method Not Allowed"})
+            return httpx.Response(200, json=check_body(request.url.path.rsplit("/", 1)[1]))
+
+        async with make_client(httpx.MockTransport(handler)) as client:
+            results = await client.check_emails(["a@example.com", "b@example.com"])
+            await client.check_emails(["c@example.com", "d@example.com"])
+
+        assert [result.email for result in results] == ["a@example.com", "b@example.com"]
+        assert requests.count(("POST", "/blacklists/batch-check")) == 1
+        assert len([request for request in requests if request[0] == "GET"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_retries_unavailable_lookups_after_retry_after(self):
+        """Test a 503 lookup is retried and the final error carries Retry-After."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(503, headers={"Retry-After": "0"}, json={"detail": "down"})
+            return httpx.Response(200, json=check_body("spam@example.com"))
+
+        async with make_client(httpx.MockTransport(handler)) as client:
+            assert (await client.check_email("spam@example.com")).is_blocked is False
+        assert calls == 2
+
+        def unavailable(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, headers={"Retry-After": "30"}, json={"detail": "down"})
+
+        async with make_client(httpx.MockTransport(unavailable)) as client:
+            with pytest.raises(ServiceUnavailableError) as error:
+                await client.check_email("spam@example.com")
+        assert error.value.retry_after == 30
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_lookups_wait_for_retry_after(self, monkeypatch):
+        """Test a 429 lookup is retried no sooner than Retry-After, and a long pause raises RateLimitedError."""
+        sleeps = []
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(429, headers={"Retry-After": "2"}, json={"detail": "Rate limit exceeded"})
+            return httpx.Response(200, json=check_body("spam@example.com"))
+
+        async with make_client(httpx.MockTransport(handler), batch_window=0) as client:
+            assert (await client.check_email("spam@example.com")).is_blocked is False
+        assert calls == 2
+        assert sleeps[-1] >= 2
+
+        def throttled(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, headers={"Retry-After": "30"}, json={"detail": "Rate limit exceeded"})
+
+        async with make_client(httpx.MockTransport(throttled), batch_window=0) as client:
+            with pytest.raises(RateLimitedError) as error:
+                await client.check_email("spam@example.com")
+        assert error.value.retry_after == 30
+        assert not isinstance(error.value, ServiceUnavailableError)
+
+    @pytest.mark.asyncio
+    async def test_writes_are_not_retried(self):
+        """Test a failed POST /blacklists is not sent twice."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503, headers={"Retry-After": "0"}, json={"detail": "down"})
+
+        async with make_client(httpx.MockTransport(handler)) as client:
+            with pytest.raises(ServiceUnavailableError):
+                await client.add_email("spam@example.com", APP_UUID)
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_responses_are_not_cached(self):
+        """Test answers flagged with X-Data-Stale are returned but not cached."""
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, headers={"X-Data-Stale": "true"}, json=check_body("spam@example.com"))
+
+        async with make_client(httpx.MockTransport(handler)) as client:
+            first = await client.check_email("spam@example.com")
+            await client.check_email("spam@example.com")
+
+        assert first.is_stale is True
+        assert calls == 2
+
+    def test_blocked_entries_are_cached_until_they_expire(self):
+        """Test the cache TTL of a blocked email never outlives its expires_at."""
+        client = make_client(httpx.MockTransport(lambda request: httpx.Response(500)), cache_ttl=60)
+        expiring = BlacklistCheckResponse(
+            email="spam@example.com",
+            is_blocked=True,
+            expires_at=datetime.utcnow() + timedelta(seconds=5),
+        )
+        permanent = BlacklistCheckResponse(email="spam@example.com", is_blocked=True)
+        missing = BlacklistCheckResponse(email="clean@example.com", is_blocked=False)
+
+        assert 0 < client._ttl_for(expiring) <= 5
+        assert client._ttl_for(permanent) == 60
+        assert client._ttl_for(missing) == client.negative_cache_ttl
+
+
+class TestTTLCache:
+    """Unit tests for the client-side TTL cache."""
+
+    def test_evicts_least_recently_used_and_expired_entries(self):
+        cache = TTLCache(max_size=2)
+        cache.put("a", 1, ttl=60)
+        cache.put("b", 2, ttl=60)
+        cache.get("a")
+        cache.put("c", 3, ttl=60)
+        cache.put("d", 4, ttl=0)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.get("d") is None
@@ -0,0 +1,48 @@
+from typing import AsyncGenerator, Awaitable, Callable
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from adapters.models import Blacklist  # noqa: F401  (registers the table)
+from db.session import Database
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """In-memory SQLite stand-in for Postgres."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(sqlite_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(sqlite_engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def make_database(tmp_path) -> AsyncGenerator[Callable[..., Awaitable[Database]], None]:
+    """Factory for ``Database``s over SQLite files in ``tmp_path``, with tables created.
+
+    Databases built with the same ``name`` share their files, so a layout with
+    more shards reuses the first ones. All of them are closed at teardown.
+    """
+    databases: list[Database] = []
+
+    async def make(shards: int = 1, name: str = "blacklist") -> Database:
+        database = Database(shard_urls=[f"sqlite+aiosqlite:///{tmp_path / f'{name}{i}.db'}" for i in range(shards)])
+        for engine in database.shard_engines:
+            async with engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.create_all)
+        databases.append(database)
+        return database
+
+    yield make
+    for database in databases:
+        await database.close()
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from db.session import Database
+
+
+@pytest_asyncio.fixture
+async def database(make_database) -> Database:
+    return await make_database()
+
+
+class TestSessionScope:
+    """Tests for the scoped sessions used by app-scoped wiring."""
+
+    @pytest.mark.asyncio
+    async def test_each_scope_gets_its_own_session(self, database: Database):
+        """Test concurrent scopes never share a session, while spawned tasks do."""
+        scoped_session = database.scoped_sessions[0]
+
+        async def current_session():
+            return scoped_session()
+
+        async def in_scope():
+            async with database.session_scope():
+                await scoped_session.execute(text("SELECT 1"))
+                session = scoped_session()
+                spawned = await asyncio.create_task(current_session())
+                return session, spawned
+
+        (first, first_spawned), (second, _) = await asyncio.gather(in_scope(), in_scope())
+
+        assert first is first_spawned
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_closed_when_the_scope_exits(self, database: Database):
+        """Test leaving a scope closes its session and leaves no scope active."""
+        scoped_session = database.scoped_sessions[0]
+
+        async with database.session_scope():
+            await scoped_session.execute(text("SELECT 1"))
+            assert scoped_session.registry.has()
+
+        with pytest.raises(RuntimeError):
+            scoped_session()
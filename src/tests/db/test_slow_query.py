@@ -0,0 +1,72 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.slow_query import SlowQueryLog, TimedAsyncQueuePool, describe_parameters
+from db.sqlite import configure_sqlite
+
+
+class TestSlowQueryLog:
+    """Unit tests for the engine-event driven slow query log."""
+
+    @pytest.mark.asyncio
+    async def test_records_statements_over_threshold_with_plan(self, tmp_path):
+        """Test slow statements are recorded with their parameter shape, and their plan is added afterwards."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}", poolclass=TimedAsyncQueuePool)
+        configure_sqlite(engine)
+        log = SlowQueryLog(threshold_ms=0, explain=True)
+        log.attach(engine)
+
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE items (email TEXT)"))
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT email FROM items WHERE email = :email"), {"email": "a@b.com"})
+                await log.wait_for_explain()
+        finally:
+            await engine.dispose()
+
+        begin, select = log.recent()[-2:]
+        assert begin.statement == "BEGIN" and begin.pool_wait_ms is None
+        assert select.statement.startswith("SELECT email FROM items")
+        assert select.parameters == "(str)"
+        assert select.duration_ms >= 0
+        assert select.pool_wait_ms is not None
+        assert select.plan and "SCAN" in " ".join(select.plan)
+
+    @pytest.mark.asyncio
+    async def test_explains_are_rate_limited(self, tmp_path):
+        """Test only one slow statement per explain interval gets a plan."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slow.db'}", poolclass=TimedAsyncQueuePool)
+        log = SlowQueryLog(threshold_ms=0, explain=True, explain_interval=60)
+        log.attach(engine)
+
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+                await log.wait_for_explain()
+        finally:
+            await engine.dispose()
+
+        assert [entry.plan is not None for entry in log.recent()] == [True, False]
+
+    def test_ignores_fast_statements(self):
+        """Test statements under the threshold are not recorded."""
+        engine = create_engine("sqlite://")
+        log = SlowQueryLog(threshold_ms=60_000)
+        log.attach(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert log.recent() == []
+
+    def test_describe_parameters_hides_values(self):
+        """Test parameter descriptions include types but never values."""
+        uuid = UUID("123e4567-e89b-12d3-a456-426614174000")
+
+        assert describe_parameters({"email": "spam@example.com", "app_uuid": uuid}) == "{email: str, app_uuid: UUID}"
+        assert describe_parameters([("a", 1), ("b", 2)], executemany=True) == "2 x (str, int)"
@@ -0,0 +1,51 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from adapters.repositories import SQLiteBlacklistRepository
+from db.session import Database
+from errors import DuplicateEmailError
+
+
+@pytest_asyncio.fixture
+async def sqlite_database(make_database) -> Database:
+    return await make_database()
+
+
+class TestSQLiteDatabase:
+    """Tests for the embedded SQLite backend."""
+
+    @pytest.mark.asyncio
+    async def test_connections_use_wal_and_tuned_pragmas(self, sqlite_database: Database):
+        """Test every connection is configured with WAL mode and the configured pragmas."""
+        async with sqlite_database.async_engine.connect() as conn:
+            journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+            synchronous = await conn.scalar(text("PRAGMA synchronous"))
+            busy_timeout = await conn.scalar(text("PRAGMA busy_timeout"))
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert busy_timeout == 5000
+        assert sqlite_database.write_queue_for(0) is not None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_go_through_single_writer(self, sqlite_database: Database):
+        """Test concurrent add_email calls are all applied and a duplicate fails on its own."""
+        emails = [f"user{i}@example.com" for i in range(20)] + ["user0@example.com"]
+
+        async def add(email: str):
+            async for session in sqlite_database.get_async_session():
+                repository = SQLiteBlacklistRepository(session, sqlite_database.write_queue_for(0))
+                return await repository.add_email(email, uuid4(), None, "127.0.0.1")
+
+        results = await asyncio.gather(*(add(email) for email in emails), return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        assert len(errors) == 1 and isinstance(errors[0], DuplicateEmailError)
+        async for session in sqlite_database.get_async_session():
+            repository = SQLiteBlacklistRepository(session, sqlite_database.write_queue_for(0))
+            entries = await repository.get_many_by_email(emails)
+        assert len(entries) == 20
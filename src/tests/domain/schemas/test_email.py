@@ -0,0 +1,90 @@
+import string
+
+import pytest
+from hypothesis import given, settings as hypothesis_settings, strategies as st
+from pydantic import BaseModel, EmailStr, ValidationError
+from pydantic.networks import validate_email
+
+from domain.schemas import FastEmailStr, validate_email_fast
+from domain.schemas import email as email_schema
+
+LOCAL_ALPHABET = string.ascii_letters + string.digits + "!#$%&'*+-/=?^_`{|}~.\"@ \\"
+DOMAIN_ALPHABET = string.ascii_letters + string.digits + ".-_[]:ñü"
+
+
+def outcome(validator, value):
+    try:
+        return "ok", validator(value)
+    except Exception as error:
+        return "error", type(error).__name__, str(error)
+
+
+def assert_same_outcome(value):
+    assert outcome(validate_email_fast, value) == outcome(lambda v: validate_email(v)[1], value)
+
+
+class TestFastEmailValidation:
+    """Tests that the fast email validator behaves exactly like EmailStr."""
+
+    @given(st.emails())
+    def test_matches_email_str_on_valid_emails(self, value):
+        """Test generated valid addresses get the same result from both validators."""
+        assert_same_outcome(value)
+
+    @given(
+        st.text(alphabet=LOCAL_ALPHABET, max_size=70),
+        st.text(alphabet=DOMAIN_ALPHABET, max_size=260),
+    )
+    @hypothesis_settings(max_examples=500)
+    def test_matches_email_str_on_crafted_addresses(self, local_part, domain):
+        """Test addresses built from email-like characters get the same result or error."""
+        assert_same_outcome(f"{local_part}@{domain}")
+
+    @given(st.text(max_size=80))
+    def test_matches_email_str_on_arbitrary_text(self, value):
+        """Test arbitrary text gets the same result or error."""
+        assert_same_outcome(value)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "Postmaster@Example.COM",
+            "user@münchen.de",
+            "a" * 64 + "@" + "b" * 63 + ".com",
+            "a" * 65 + "@example.com",
+            "user@" + ".".join(["a" * 63] * 4) + ".com",
+            "user..name@example.com",
+            "user@localhost",
+            "user@example.invalid",
+            "user@-example.com",
+            "Name <user@example.com>",
+        ],
+    )
+    def test_matches_email_str_on_edge_cases(self, value):
+        """Test length limits, IDN, special-use and malformed addresses get the same result or error."""
+        assert_same_outcome(value)
+
+    def test_model_field_errors_match_email_str(self):
+        """Test a FastEmailStr model field reports the same validation errors as EmailStr."""
+        class Fast(BaseModel):
+            email: FastEmailStr
+
+        class Reference(BaseModel):
+            email: EmailStr
+
+        for value in ["user@example.com", "not-an-email", "user@localhost"]:
+            try:
+                expected = Reference(email=value).email
+            except ValidationError as error:
+                with pytest.raises(ValidationError) as fast_error:
+                    Fast(email=value)
+                assert fast_error.value.errors(include_url=False) == error.errors(include_url=False)
+            else:
+                assert Fast(email=value).email == expected
+
+    def test_falls_back_to_email_str_without_validator_internals(self, monkeypatch):
+        """Test every address takes the regular path when email-validator's internals cannot be imported."""
+        monkeypatch.setattr(email_schema, "SIMPLE_EMAIL_RE", None)
+
+        assert validate_email_fast("Postmaster@Example.COM") == "postmaster@example.com"
+        assert_same_outcome("not-an-email")
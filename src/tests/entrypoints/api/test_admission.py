@@ -0,0 +1,142 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from assembly import get_check_email_use_case
+from config import settings
+from domain.schemas import BlacklistCheckResponse
+from domain.use_cases import CheckEmailInBlacklistUseCase
+from entrypoints.api import admission
+from entrypoints.api.admission import ConcurrencyLimiter, TokenBucketRateLimiter
+from entrypoints.api.dependencies import verify_token
+from entrypoints.api.main import app
+
+
+class TestConcurrencyLimiter:
+    """Unit tests for the in-flight request limiter."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_full_and_queue_times_out(self):
+        """Test acquire fails fast once the limit is reached."""
+        limiter = ConcurrencyLimiter(limit=1, queue_timeout=0.01)
+
+        assert await limiter.acquire() is True
+        assert await limiter.acquire() is False
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_release_hands_slot_to_waiter(self):
+        """Test a queued request gets the slot released by another one."""
+        limiter = ConcurrencyLimiter(limit=1, queue_timeout=1)
+        assert await limiter.acquire() is True
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release()
+
+        assert await waiter is True
+        assert limiter.in_flight == 1
+        limiter.release()
+        assert limiter.in_flight == 0
+
+
+class TestTokenBucketRateLimiter:
+    """Unit tests for the per-app token bucket."""
+
+    def test_limits_each_key_independently(self):
+        """Test a key is throttled after its burst while other keys are not."""
+        limiter = TokenBucketRateLimiter(rate=1, burst=2)
+
+        assert limiter.acquire("app-a") is None
+        assert limiter.acquire("app-a") is None
+        retry_after = limiter.acquire("app-a")
+        assert retry_after is not None and 0 < retry_after <= 1
+        assert limiter.acquire("app-b") is None
+
+    def test_zero_rate_disables_limiting(self):
+        """Test a rate of zero never throttles."""
+        limiter = TokenBucketRateLimiter(rate=0, burst=0)
+
+        assert all(limiter.acquire("app-a") is None for _ in range(10))
+
+
+class TestAdmissionControl:
+    """Tests for admission control on the blacklist routes."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_returns_429(self, monkeypatch):
+        """Test requests over the app's rate get 429 with Retry-After."""
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketRateLimiter(rate=0.5, burst=1))
+        mock_use_case = Mock(spec=CheckEmailInBlacklistUseCase)
+        mock_use_case.execute = AsyncMock(
+            return_value=BlacklistCheckResponse(email="clean@example.com", is_blocked=False)
+        )
+        app.dependency_overrides[verify_token] = lambda: "test-token"
+        app.dependency_overrides[get_check_email_use_case] = lambda: mock_use_case
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                headers = {"Authorization": "Bearer test-token", "X-App-UUID": "app-a"}
+                first = await client.get("/blacklists/clean@example.com", headers=headers)
+                second = await client.get("/blacklists/clean@example.com", headers=headers)
+
+            assert first.status_code == status.HTTP_200_OK
+            assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            assert second.headers["Retry-After"] == "2"
+            mock_use_case.execute.assert_called_once()
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_saturated_service_returns_503(self, monkeypatch):
+        """Test requests are shed with 503 when no slot frees up in time."""
+        limiter = ConcurrencyLimiter(limit=1, queue_timeout=0.01)
+        await limiter.acquire()
+        monkeypatch.setattr(admission, "concurrency_limiter", limiter)
+        mock_use_case = Mock(spec=CheckEmailInBlacklistUseCase)
+        mock_use_case.execute = AsyncMock()
+        app.dependency_overrides[verify_token] = lambda: "test-token"
+        app.dependency_overrides[get_check_email_use_case] = lambda: mock_use_case
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get(
+                    "/blacklists/clean@example.com",
+                    headers={"Authorization": "Bearer test-token"},
+                )
+
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert response.headers["Retry-After"] == "1"
+            mock_use_case.execute.assert_not_called()
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_requests_do_not_spend_app_tokens(self, monkeypatch):
+        """Test requests with a bad token get 401 without draining the app's bucket."""
+        monkeypatch.setattr(admission, "rate_limiter", TokenBucketRateLimiter(rate=0.5, burst=1))
+        mock_use_case = Mock(spec=CheckEmailInBlacklistUseCase)
+        mock_use_case.execute = AsyncMock(
+            return_value=BlacklistCheckResponse(email="clean@example.com", is_blocked=False)
+        )
+        app.dependency_overrides[get_check_email_use_case] = lambda: mock_use_case
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                for _ in range(3):
+                    rejected = await client.get(
+                        "/blacklists/clean@example.com",
+                        headers={"Authorization": "Bearer wrong-token", "X-App-UUID": "app-a"},
+                    )
+                    assert rejected.status_code == status.HTTP_401_UNAUTHORIZED
+                response = await client.get(
+                    "/blacklists/clean@example.com",
+                    headers={"Authorization": f"Bearer {settings.auth_token}", "X-App-UUID": "app-a"},
+                )
+
+            assert response.status_code == status.HTTP_200_OK
+        finally:
+            app.dependency_overrides.clear()
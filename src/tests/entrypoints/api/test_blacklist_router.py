@@ -7,14 +7,23 @@ from httpx import AsyncClient, ASGITransport
 from fastapi import status
 
 from domain.schemas import (
+    BlacklistBatchCheckResponse,
     BlacklistCheckResponse,
     BlacklistCreateResponse,
 )
-from domain.use_cases import AddEmailToBlacklistUseCase, CheckEmailInBlacklistUseCase
-from assembly import get_add_email_use_case, get_check_email_use_case
+from domain.use_cases import (
+    AddEmailToBlacklistUseCase,
+    CheckEmailInBlacklistUseCase,
+    CheckEmailsInBlacklistUseCase,
+)
+from assembly import (
+    get_add_email_use_case,
+    get_batch_check_email_use_case,
+    get_check_email_use_case,
+)
 from entrypoints.api.dependencies import verify_token
 from entrypoints.api.main import app
-from errors import DuplicateEmailError
+from errors import DuplicateEmailError, ServiceUnavailableError
 
 
 class TestBlacklistRouter:
@@ -286,3 +295,96 @@ class TestBlacklistRouter:
             assert "detail" in data
         finally:
             app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_get_blacklists_email_stale_result(self):
+        """Test GET /blacklists/{email} flags answers served from last known results."""
+        email = "spam@example.com"
+        mock_response = BlacklistCheckResponse(
+            email=email,
+            is_blocked=True,
+            blocked_reason="User reported for spam",
+            blocked_at=datetime.now(timezone.utc),
+            is_stale=True,
+        )
+
+        mock_use_case = Mock(spec=CheckEmailInBlacklistUseCase)
+        mock_use_case.execute = AsyncMock(return_value=mock_response)
+
+        app.dependency_overrides[verify_token] = lambda: "test-token"
+        app.dependency_overrides[get_check_email_use_case] = lambda: mock_use_case
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get(
+                    f"/blacklists/{email}",
+                    headers={"Authorization": "Bearer test-token"},
+                )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["X-Data-Stale"] == "true"
+            assert "is_stale" not in response.json()
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_get_blacklists_email_storage_unavailable(self):
+        """Test GET /blacklists/{email} returns 503 when storage is down and nothing is cached."""
+        mock_use_case = Mock(spec=CheckEmailInBlacklistUseCase)
+        mock_use_case.execute = AsyncMock(
+            side_effect=ServiceUnavailableError("Blacklist storage is unavailable", retry_after=4.2)
+        )
+
+        app.dependency_overrides[verify_token] = lambda: "test-token"
+        app.dependency_overrides[get_check_email_use_case] = lambda: mock_use_case
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get(
+                    "/blacklists/new@example.com",
+                    headers={"Authorization": "Bearer test-token"},
+                )
+
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            assert response.headers["Retry-After"] == "5"
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_post_blacklists_batch_check(self):
+        """Test POST /blacklists/batch-check returns one result per email, in order."""
+        mock_response = BlacklistBatchCheckResponse(
+            results=[
+                BlacklistCheckResponse(email="spam@example.com", is_blocked=True, blocked_reason="spam"),
+                BlacklistCheckResponse(email="clean@example.com", is_blocked=False),
+            ],
+            is_stale=True,
+        )
+        mock_use_case = Mock(spec=CheckEmailsInBlacklistUseCase)
+        mock_use_case.execute = AsyncMock(return_value=mock_response)
+
+        app.dependency_overrides[verify_token] = lambda: "test-token"
+        app.dependency_overrides[get_batch_check_email_use_case] = lambda: mock_use_case
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.post(
+                    "/blacklists/batch-check",
+                    json={"emails": ["spam@example.com", "clean@example.com"]},
+                    headers={"Authorization": "Bearer test-token"},
+                )
+                empty = await client.post(
+                    "/blacklists/batch-check",
+                    json={"emails": []},
+                    headers={"Authorization": "Bearer test-token"},
+                )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["X-Data-Stale"] == "true"
+            data = response.json()
+            assert [result["email"] for result in data["results"]] == ["spam@example.com", "clean@example.com"]
+            assert data["results"][0]["is_blocked"] is True
+            assert "is_stale" not in data["results"][0]
+            assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,52 @@
+from collections import Counter
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from entrypoints.api.dependencies import verify_token
+from entrypoints.api.main import app
+from entrypoints.api.profiler import collapse_stacks
+
+
+class TestDebugRouter:
+    """Unit tests for the profiling endpoints."""
+
+    def test_collapse_stacks_format(self):
+        """Test samples render as 'frame;frame count' lines, most frequent first."""
+        counts = Counter({
+            "MainThread;run (main.py:1)": 1,
+            "MainThread;run (main.py:1);check (blacklist.py:10)": 3,
+        })
+
+        assert collapse_stacks(counts) == (
+            "MainThread;run (main.py:1);check (blacklist.py:10) 3\n"
+            "MainThread;run (main.py:1) 1\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_profile_returns_collapsed_stacks(self):
+        """Test GET /debug/profile samples the event loop thread."""
+        app.dependency_overrides[verify_token] = lambda: "test-token"
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get(
+                    "/debug/profile",
+                    params={"seconds": 0.05, "interval_ms": 5},
+                    headers={"Authorization": "Bearer test-token"},
+                )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["content-type"].startswith("text/plain")
+            assert "MainThread" in response.text
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_profile_requires_authentication(self):
+        """Test GET /debug/profile rejects requests without a token."""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/debug/profile", params={"seconds": 0.05})
+
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
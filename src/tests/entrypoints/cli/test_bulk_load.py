@@ -0,0 +1,119 @@
+import json
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import func, select
+
+from adapters.models import Blacklist
+from adapters.repositories import SQLModelBlacklistRepository
+from db.session import Database
+from entrypoints.cli.bulk_load import bulk_load
+
+APP_UUID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+async def count_rows(database: Database) -> int:
+    async with database.async_engine.connect() as conn:
+        return await conn.scalar(select(func.count()).select_from(Blacklist.__table__))
+
+
+def write_csv(path, emails: list[str]) -> str:
+    lines = ["email,app_uuid,blocked_reason"] + [f"{email},{APP_UUID},spam" for email in emails]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+class TestBulkLoad:
+    """Tests for the offline bulk loader, on SQLite."""
+
+    @pytest.mark.asyncio
+    async def test_loads_valid_rows_and_skips_duplicates(self, tmp_path, make_database):
+        """Test valid rows are inserted once and invalid rows are reported."""
+        database = await make_database()
+        emails = [f"user{i}@example.com" for i in range(25)]
+        source = write_csv(tmp_path / "blocklist.csv", emails + ["user0@example.com", "not-an-email"])
+
+        async for session in database.get_async_session():
+            await SQLModelBlacklistRepository(session).add_email(
+                "user1@example.com", UUID(APP_UUID), "already", "127.0.0.1"
+            )
+
+        report = await bulk_load(database, source, chunk_size=10, workers=3)
+
+        assert report.rows == 27
+        assert report.invalid == 1
+        assert report.inserted == 24
+        assert report.already_blocked == 2
+        assert report.chunks_loaded == 3
+        assert report.errors[0].startswith("row 27:")
+        assert await count_rows(database) == 25
+
+    @pytest.mark.asyncio
+    async def test_ndjson_rows_keep_optional_fields(self, tmp_path, make_database):
+        """Test NDJSON input and the per-row ip_address and expires_at fields."""
+        database = await make_database()
+        expires_at = (datetime.utcnow() + timedelta(days=1)).replace(microsecond=0)
+        source = tmp_path / "blocklist.ndjson"
+        source.write_text(
+            json.dumps({"email": "spam@example.com", "ip_address": "10.0.0.1", "expires_at": expires_at.isoformat()})
+            + "\n"
+        )
+
+        report = await bulk_load(database, str(source), app_uuid=APP_UUID)
+        async for session in database.get_async_session():
+            entry = await SQLModelBlacklistRepository(session).get_by_email("spam@example.com")
+
+        assert report.inserted == 1
+        assert entry.ip_address == "10.0.0.1"
+        assert entry.expires_at == expires_at
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_checkpoint(self, tmp_path, make_database):
+        """Test chunks recorded in the checkpoint are not loaded again."""
+        database = await make_database()
+        source = write_csv(tmp_path / "blocklist.csv", [f"user{i}@example.com" for i in range(20)])
+        checkpoint = tmp_path / "progress.json"
+        checkpoint.write_text(
+            json.dumps({"source": str(tmp_path / "blocklist.csv"), "chunk_size": 10, "completed_chunks": [0]})
+        )
+
+        report = await bulk_load(database, source, chunk_size=10, checkpoint_path=str(checkpoint))
+
+        assert report.chunks_skipped == 1
+        assert report.inserted == 10
+        assert json.loads(checkpoint.read_text())["completed_chunks"] == [0, 1]
+        with pytest.raises(ValueError):
+            await bulk_load(database, source, chunk_size=5, checkpoint_path=str(checkpoint))
+
+    @pytest.mark.asyncio
+    async def test_dry_run_only_validates(self, tmp_path, make_database):
+        """Test a dry run reports invalid rows without writing anything."""
+        database = await make_database()
+        source = write_csv(tmp_path / "blocklist.csv", ["spam@example.com", "bad@", "clean@example.com"])
+
+        report = await bulk_load(database, source, dry_run=True)
+
+        assert (report.valid, report.invalid, report.inserted) == (2, 1, 0)
+        assert await count_rows(database) == 0
+
+    @pytest.mark.asyncio
+    async def test_sqlite_writes_go_through_the_write_queue(self, tmp_path, make_database, monkeypatch):
+        """Test parallel workers on SQLite write through the single-writer queue."""
+        database = await make_database()
+        queue = database.write_queue_for(0)
+        submitted = []
+        submit = queue.submit
+
+        async def counting_submit(write):
+            submitted.append(write)
+            return await submit(write)
+
+        monkeypatch.setattr(queue, "submit", counting_submit)
+        source = write_csv(tmp_path / "blocklist.csv", [f"user{i}@example.com" for i in range(30)])
+
+        report = await bulk_load(database, source, chunk_size=10, workers=3)
+
+        assert len(submitted) == 3
+        assert report.inserted == 30
+        assert await count_rows(database) == 30
@@ -0,0 +1,112 @@
+from uuid import uuid4
+
+import pytest
+
+from adapters.repositories import (
+    ShardedBlacklistRepository,
+    SQLModelBlacklistRepository,
+    shard_for,
+)
+from entrypoints.cli import reshard as reshard_module
+from db.session import Database
+from entrypoints.cli.reshard import ReshardVerificationError, database_identity, reshard
+
+
+class TestReshard:
+    """Tests for moving rows from two to three shards."""
+
+    @pytest.mark.asyncio
+    async def test_moves_rows_to_new_owner_and_is_rerunnable(self, make_database):
+        """Test every row ends up only on its new shard and a second run moves nothing."""
+        emails = [f"user{i}@example.com" for i in range(30)]
+        source = await make_database(shards=2, name="shard")
+        target = await make_database(shards=3, name="shard")
+
+        async for sessions in source.get_shard_sessions():
+            repository = ShardedBlacklistRepository([SQLModelBlacklistRepository(s) for s in sessions])
+            for email in emails:
+                await repository.add_email(email, uuid4(), "spam", "127.0.0.1")
+
+        dry_run = await reshard(source, target, batch_size=7, dry_run=True)
+        report = await reshard(source, target, batch_size=7, delete_source=True)
+        second = await reshard(target, target, batch_size=7)
+
+        assert dry_run.moved == report.moved == report.deleted > 0
+        assert report.scanned == len(emails)
+        assert second.moved == 0
+        async for sessions in target.get_shard_sessions():
+            shards = [SQLModelBlacklistRepository(s) for s in sessions]
+            for email in emails:
+                owner = shard_for(email, 3)
+                for index, shard in enumerate(shards):
+                    assert (await shard.email_exists(email)) is (index == owner)
+
+    @pytest.mark.asyncio
+    async def test_refuses_to_delete_when_writes_land_after_the_copy(self, make_database, monkeypatch):
+        """Test a row written to an old shard during the run blocks --delete-source and nothing is deleted."""
+        emails = [f"user{i}@example.com" for i in range(30)]
+        late_email = next(f"late{i}@example.com" for i in range(100) if shard_for(f"late{i}@example.com", 3) == 2)
+        source = await make_database(shards=2, name="shard")
+        target = await make_database(shards=3, name="shard")
+        verify_copy = reshard_module.verify_copy
+
+        async def write_then_verify(*args):
+            async for sessions in source.get_shard_sessions():
+                repository = ShardedBlacklistRepository([SQLModelBlacklistRepository(s) for s in sessions])
+                await repository.add_email(late_email, uuid4(), "spam", "127.0.0.1")
+            return await verify_copy(*args)
+
+        monkeypatch.setattr(reshard_module, "verify_copy", write_then_verify)
+
+        async for sessions in source.get_shard_sessions():
+            repository = ShardedBlacklistRepository([SQLModelBlacklistRepository(s) for s in sessions])
+            for email in emails:
+                await repository.add_email(email, uuid4(), "spam", "127.0.0.1")
+
+        with pytest.raises(ReshardVerificationError) as error:
+            await reshard(source, target, batch_size=7, delete_source=True)
+
+        report = error.value.report
+        assert report.deleted == 0
+        assert report.expected_per_shard[2] == report.copied_per_shard[2] + 1
+        async for sessions in source.get_shard_sessions():
+            repository = ShardedBlacklistRepository([SQLModelBlacklistRepository(s) for s in sessions])
+            for email in emails + [late_email]:
+                assert await repository.email_exists(email) is True
+
+    @pytest.mark.asyncio
+    async def test_refuses_a_source_database_spelled_differently_as_target(self, tmp_path, make_database):
+        """Test a target URL that names a source database another way is rejected before anything is copied."""
+        source = await make_database(name="a")
+        await make_database(name="b")
+        target = Database(
+            shard_urls=[f"sqlite+aiosqlite:///{tmp_path}/./a0.db", f"sqlite+aiosqlite:///{tmp_path}/b0.db"]
+        )
+
+        async for session in source.get_async_session():
+            repository = SQLModelBlacklistRepository(session)
+            for i in range(20):
+                await repository.add_email(f"user{i}@example.com", uuid4(), "spam", "127.0.0.1")
+
+        try:
+            with pytest.raises(ValueError, match="spelled differently"):
+                await reshard(source, target, delete_source=True)
+        finally:
+            await target.close()
+
+        async for session in source.get_async_session():
+            repository = SQLModelBlacklistRepository(session)
+            for i in range(20):
+                assert await repository.email_exists(f"user{i}@example.com") is True
+
+    def test_database_identity_ignores_spelling(self, tmp_path):
+        """Test URLs naming the same database compare equal across drivers, default ports and paths."""
+        assert database_identity(f"sqlite+aiosqlite:///{tmp_path}/./a.db") == database_identity(
+            f"sqlite:///{tmp_path}/a.db"
+        )
+        assert database_identity("postgresql+asyncpg://u:p@DB-Host/blacklist") == database_identity(
+            "postgresql://other@db-host:5432/blacklist"
+        )
+        assert database_identity("postgresql://u@db-host/blacklist") != database_identity(
+            "postgresql://u@db-host:5433/blacklist"
+        )
@@ -0,0 +1,134 @@
+import importlib.util
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import pytest
+
+# stress-tests/ is a directory of scripts, not a package.
+SCRIPT = Path(__file__).resolve().parents[3] / "stress-tests" / "load_generator.py"
+spec = importlib.util.spec_from_file_location("load_generator", SCRIPT)
+load_generator = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = load_generator
+spec.loader.exec_module(load_generator)
+
+LatencyHistogram = load_generator.LatencyHistogram
+LoadGenerator = load_generator.LoadGenerator
+PreloadError = load_generator.PreloadError
+Scenario = load_generator.Scenario
+ZipfSampler = load_generator.ZipfSampler
+
+
+def make_scenario(**overrides) -> Scenario:
+    values = dict(
+        rate=100.0,
+        duration=1.0,
+        read_ratio=0.9,
+        duplicate_ratio=0.1,
+        keyspace=100,
+        zipf_s=1.1,
+        preload=3,
+        max_in_flight=100,
+        timeout=1.0,
+        seed=0,
+    )
+    values.update(overrides)
+    return Scenario(**values)
+
+
+class TestLatencyHistogram:
+    """Unit tests for the load generator's latency histogram."""
+
+    def test_percentiles_use_nearest_rank(self):
+        """Test a percentile is the smallest sample with that share of samples at or below it."""
+        histogram = LatencyHistogram()
+        for milliseconds in range(1, 11):
+            histogram.record(milliseconds / 1000)
+
+        assert histogram.percentile(45) == pytest.approx(5, rel=2**-6)
+        assert histogram.percentile(50) == pytest.approx(5, rel=2**-6)
+        assert histogram.percentile(91) == pytest.approx(10, rel=2**-6)
+        assert histogram.percentile(100) == 10
+
+    def test_values_keep_relative_error_bound(self):
+        """Test recorded values are reported within the bucket's relative error, never above max."""
+        histogram = LatencyHistogram(sub_bucket_bits=7)
+        for value_us in (1, 127, 128, 1_000, 123_456, 9_876_543):
+            single = LatencyHistogram(sub_bucket_bits=7)
+            single.record(value_us / 1_000_000)
+            histogram.merge(single)
+
+            reported_us = single.percentile(50) * 1000
+            assert value_us <= reported_us <= value_us * (1 + 2**-6)
+
+        assert histogram.total == 6
+        assert histogram.min_us == 1
+        assert histogram.percentile(100) == 9_876.543
+
+    def test_empty_histogram_has_no_percentiles(self):
+        """Test an empty histogram reports no latencies instead of zeros."""
+        summary = LatencyHistogram().summary()
+
+        assert summary["count"] == 0
+        assert summary["min_ms"] is None
+        assert summary["p99_ms"] is None
+
+
+class TestZipfSampler:
+    """Unit tests for the Zipf popularity sampler."""
+
+    def test_samples_follow_zipf_weights(self):
+        """Test rank frequencies match 1 / (rank + 1) ** s within sampling noise."""
+        n, s, draws = 50, 1.1, 100_000
+        sampler = ZipfSampler(n, s, random.Random(0))
+        counts = Counter(sampler.sample() for _ in range(draws))
+        total_weight = sum(1 / (rank + 1) ** s for rank in range(n))
+
+        assert set(counts) <= set(range(n))
+        for rank in (0, 1, 9):
+            expected = draws / (rank + 1) ** s / total_weight
+            assert counts[rank] == pytest.approx(expected, rel=0.05)
+
+    def test_zero_exponent_is_uniform(self):
+        """Test s = 0 draws every rank with the same probability."""
+        sampler = ZipfSampler(4, 0, random.Random(1))
+        counts = Counter(sampler.sample() for _ in range(40_000))
+
+        assert sorted(counts) == [0, 1, 2, 3]
+        assert all(count == pytest.approx(10_000, rel=0.05) for count in counts.values())
+
+
+class TestLoadGenerator:
+    """Tests for how the load generator treats the API's answers."""
+
+    @pytest.mark.asyncio
+    async def test_preload_fails_on_unexpected_status(self):
+        """Test preload accepts already blocked emails but stops on any other failure."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["X-App-UUID"] in ("app-a", "app-b")
+            return httpx.Response(409 if b"user0@" in request.content else 500, json={"detail": "boom"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            generator = LoadGenerator(client, make_scenario(), ["app-a", "app-b"])
+            with pytest.raises(PreloadError, match="HTTP 500"):
+                await generator.preload()
+
+    @pytest.mark.asyncio
+    async def test_throttled_requests_are_counted_apart(self):
+        """Test 429 answers are reported as throttled and kept out of the latencies."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers["X-App-UUID"] == "busy-app":
+                return httpx.Response(429, headers={"Retry-After": "1"})
+            return httpx.Response(200, json={})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            generator = LoadGenerator(client, make_scenario(), ["busy-app"])
+            await generator.send("read", "busy-app", "GET", "/blacklists/a@example.com", None, 0.0)
+            await generator.send("read", "idle-app", "GET", "/blacklists/a@example.com", None, 0.0)
+
+        results = generator.results
+        assert results.throttled["read"] == 1
+        assert results.histograms["read"].total == 1
+        assert results.errors["read"] == Counter()
@@ -0,0 +1,448 @@
+"""Open-loop load generator for the Blacklist API.
+
+Requests are started on a Poisson schedule at the target rate, whether or not
+earlier requests have finished, and latency is measured from the moment each
+request was scheduled. A slow server therefore shows up as higher latency
+instead of silently lowering the offered load.
+
+The API rate-limits each app separately (``RATE_LIMIT_PER_SECOND``), so
+requests are spread over ``--apps`` app keys sent in ``X-App-UUID``. Throttled
+(429) responses are counted apart and kept out of the latency histograms; if
+they show up, raise ``--apps`` or start the API with ``RATE_LIMIT_PER_SECOND=0``.
+
+Usage (from the repository root, with the API running on localhost:9000):
+    python stress-tests/load_generator.py --rate 200 --duration 30
+    python stress-tests/load_generator.py --rate 500 --read-ratio 0.95 --output results/run.json
+    python stress-tests/load_generator.py --rate 500 --output results/new.json --compare results/run.json
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import uuid4
+
+import httpx
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+OPERATIONS = ("read", "write")
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in microseconds, in the style of HdrHistogram.
+
+    Every power of two is split into ``2 ** sub_bucket_bits`` linear buckets,
+    so recorded values keep a relative error below ``2 ** (1 - sub_bucket_bits)``
+    (under 2% with the default) whatever their magnitude.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Counter[int] = Counter()
+        self.total = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _bucket(self, value_us: int) -> int:
+        shift = max(0, value_us.bit_length() - self.sub_bucket_bits)
+        return (shift << self.sub_bucket_bits) | (value_us >> shift)
+
+    def _bounds(self, bucket: int) -> tuple[int, int]:
+        shift = bucket >> self.sub_bucket_bits
+        sub_bucket = bucket & ((1 << self.sub_bucket_bits) - 1)
+        lower = sub_bucket << shift
+        return lower, lower + (1 << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value_us = max(0, round(seconds * 1_000_000))
+        self.counts[self._bucket(value_us)] += 1
+        self.total += 1
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts.update(other.counts)
+        self.total += other.total
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given percentile, in milliseconds."""
+        if not self.total:
+            return None
+        # Nearest rank: the smallest value with at least ``percentile`` % of the samples at or below it.
+        rank = max(1, math.ceil(percentile / 100 * self.total))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self._bounds(bucket)[1], self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> dict:
+        return {
+            "count": self.total,
+            "min_ms": self.min_us / 1000 if self.min_us is not None else None,
+            "max_ms": self.max_us / 1000,
+            **{f"p{percentile:g}_ms": self.percentile(percentile) for percentile in PERCENTILES},
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            **self.summary(),
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "buckets": [
+                [*self._bounds(bucket), self.counts[bucket]] for bucket in sorted(self.counts)
+            ],
+        }
+
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with probability proportional to ``1 / (rank + 1) ** s``."""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.rng = rng
+        weights = [1 / (rank + 1) ** s for rank in range(n)]
+        total = sum(weights)
+        cumulative = 0.0
+        self._cumulative = []
+        for weight in weights:
+            cumulative += weight / total
+            self._cumulative.append(cumulative)
+
+    def sample(self) -> int:
+        return min(bisect.bisect_left(self._cumulative, self.rng.random()), len(self._cumulative) - 1)
+
+
+@dataclass
+class Scenario:
+    rate: float
+    duration: float
+    read_ratio: float
+    duplicate_ratio: float
+    keyspace: int
+    zipf_s: float
+    preload: int
+    max_in_flight: int
+    timeout: float
+    seed: int
+
+
+@dataclass
+class Results:
+    histograms: dict[str, LatencyHistogram] = field(
+        default_factory=lambda: {operation: LatencyHistogram() for operation in OPERATIONS}
+    )
+    statuses: dict[str, Counter] = field(
+        default_factory=lambda: {operation: Counter() for operation in OPERATIONS}
+    )
+    errors: dict[str, Counter] = field(
+        default_factory=lambda: {operation: Counter() for operation in OPERATIONS}
+    )
+    throttled: Counter = field(default_factory=Counter)
+    scheduled: int = 0
+    dropped: int = 0
+    max_lag_ms: float = 0.0
+    elapsed: float = 0.0
+
+
+EXPECTED_STATUSES = {"read": {200}, "write": {201, 409}}
+THROTTLED_STATUS = 429
+
+
+class PreloadError(Exception):
+    pass
+
+
+class LoadGenerator:
+    def __init__(self, client: httpx.AsyncClient, scenario: Scenario, app_uuids: list[str]):
+        self.client = client
+        self.scenario = scenario
+        self.app_uuids = app_uuids
+        self.rng = random.Random(scenario.seed)
+        self.popularity = ZipfSampler(scenario.keyspace, scenario.zipf_s, self.rng)
+        self.run_id = uuid4().hex[:8]
+        self._written: list[str] = []
+        self._fresh = 0
+        self.results = Results()
+
+    def popular_email(self, rank: int) -> str:
+        return f"user{rank}@load.example.com"
+
+    def fresh_email(self) -> str:
+        self._fresh += 1
+        return f"new-{self.run_id}-{self._fresh}@load.example.com"
+
+    async def preload(self) -> None:
+        """Block the most popular emails so reads see a realistic hit rate (not measured).
+
+        An email already blocked by an earlier run (409) is fine; any other
+        non-2xx answer means the run would measure the wrong thing, so it fails.
+        """
+        semaphore = asyncio.Semaphore(32)
+
+        async def block(email: str) -> None:
+            app_uuid = self.rng.choice(self.app_uuids)
+            async with semaphore:
+                response = await self.client.post(
+                    "/blacklists", json=self.write_body(email, app_uuid), headers={"X-App-UUID": app_uuid}
+                )
+            if response.status_code == THROTTLED_STATUS:
+                raise PreloadError(
+                    "Preload was rate limited (429): raise --apps or start the API with RATE_LIMIT_PER_SECOND=0"
+                )
+            if not response.is_success and response.status_code != 409:
+                raise PreloadError(f"Preload of {email} failed: HTTP {response.status_code} {response.text}")
+            self._written.append(email)
+
+        await asyncio.gather(*(block(self.popular_email(rank)) for rank in range(self.scenario.preload)))
+
+    def write_body(self, email: str, app_uuid: str) -> dict:
+        return {"email": email, "app_uuid": app_uuid, "blocked_reason": "load test"}
+
+    def next_request(self) -> tuple[str, str, str, str, Optional[dict]]:
+        app_uuid = self.rng.choice(self.app_uuids)
+        if self.rng.random() < self.scenario.read_ratio:
+            email = self.popular_email(self.popularity.sample())
+            return "read", app_uuid, "GET", f"/blacklists/{email}", None
+        if self._written and self.rng.random() < self.scenario.duplicate_ratio:
+            email = self.rng.choice(self._written)
+        else:
+            email = self.fresh_email()
+            self._written.append(email)
+        return "write", app_uuid, "POST", "/blacklists", self.write_body(email, app_uuid)
+
+    async def send(
+        self, operation: str, app_uuid: str, method: str, path: str, body: Optional[dict], scheduled_at: float
+    ):
+        results = self.results
+        try:
+            response = await self.client.request(method, path, json=body, headers={"X-App-UUID": app_uuid})
+        except httpx.HTTPError as error:
+            results.histograms[operation].record(time.perf_counter() - scheduled_at)
+            results.errors[operation][type(error).__name__] += 1
+            return
+        results.statuses[operation][str(response.status_code)] += 1
+        if response.status_code == THROTTLED_STATUS:
+            # A rejection by the rate limiter says nothing about how fast the work is done.
+            results.throttled[operation] += 1
+            return
+        results.histograms[operation].record(time.perf_counter() - scheduled_at)
+        if response.status_code not in EXPECTED_STATUSES[operation]:
+            results.errors[operation][f"HTTP {response.status_code}"] += 1
+
+    async def run(self) -> Results:
+        scenario = self.scenario
+        results = self.results
+        in_flight: set[asyncio.Task] = set()
+        started_at = time.perf_counter()
+        next_at = started_at
+        deadline = started_at + scenario.duration
+
+        while True:
+            next_at += self.rng.expovariate(scenario.rate)
+            if next_at >= deadline:
+                break
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                results.max_lag_ms = max(results.max_lag_ms, -delay * 1000)
+            results.scheduled += 1
+            operation, app_uuid, method, path, body = self.next_request()
+            if len(in_flight) >= scenario.max_in_flight:
+                # The client, not the server, is the bottleneck: count it rather than queueing.
+                results.dropped += 1
+                results.errors[operation]["dropped (max in flight)"] += 1
+                continue
+            task = asyncio.create_task(self.send(operation, app_uuid, method, path, body, next_at))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.wait(in_flight, timeout=scenario.timeout + 1)
+        results.elapsed = time.perf_counter() - started_at
+        return results
+
+
+def build_report(scenario: Scenario, results: Results, base_url: str) -> dict:
+    overall = LatencyHistogram()
+    operations = {}
+    for operation in OPERATIONS:
+        histogram = results.histograms[operation]
+        overall.merge(histogram)
+        operations[operation] = {
+            "latency": histogram.to_dict(),
+            "throughput_rps": round(histogram.total / results.elapsed, 2) if results.elapsed else 0.0,
+            "statuses": dict(results.statuses[operation]),
+            "throttled": results.throttled[operation],
+            "errors": dict(results.errors[operation]),
+        }
+    completed = overall.total
+    throttled = sum(results.throttled.values())
+    errors = sum(sum(counter.values()) for counter in results.errors.values())
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": base_url,
+        "scenario": scenario.__dict__,
+        "elapsed_s": round(results.elapsed, 3),
+        "scheduled": results.scheduled,
+        "completed": completed,
+        "dropped": results.dropped,
+        "throttled": throttled,
+        "throttled_rate": round(throttled / results.scheduled, 6) if results.scheduled else 0.0,
+        "max_schedule_lag_ms": round(results.max_lag_ms, 3),
+        "throughput_rps": round(completed / results.elapsed, 2) if results.elapsed else 0.0,
+        "error_rate": round(errors / results.scheduled, 6) if results.scheduled else 0.0,
+        "latency": overall.summary(),
+        "operations": operations,
+    }
+
+
+def format_ms(value: Optional[float]) -> str:
+    return f"{value:9.2f}" if value is not None else f"{'-':>9}"
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n{report['completed']} requests in {report['elapsed_s']:.1f}s "
+        f"({report['throughput_rps']:.1f} req/s, {report['dropped']} dropped, "
+        f"{report['throttled']} throttled, error rate {report['error_rate']:.2%})"
+    )
+    print(f"{'':8}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'p99.9 ms':>10}{'max ms':>10}")
+    rows = [("all", report["latency"])] + [
+        (operation, data["latency"]) for operation, data in report["operations"].items()
+    ]
+    for name, latency in rows:
+        print(
+            f"{name:8}{latency['count']:>8} {format_ms(latency['p50_ms'])} {format_ms(latency['p90_ms'])} "
+            f"{format_ms(latency['p99_ms'])} {format_ms(latency['p99.9_ms'])} {format_ms(latency['max_ms'])}"
+        )
+    for operation, data in report["operations"].items():
+        if data["statuses"] or data["errors"]:
+            print(f"{operation}: statuses={data['statuses']} throttled={data['throttled']} errors={data['errors']}")
+    if report["throttled"]:
+        print(
+            f"warning: {report['throttled_rate']:.1%} of the requests were rate limited (429) and are not in "
+            "the latencies; raise --apps or start the API with RATE_LIMIT_PER_SECOND=0"
+        )
+    if report["max_schedule_lag_ms"] > 10:
+        print(
+            f"warning: the generator fell up to {report['max_schedule_lag_ms']:.0f} ms behind schedule; "
+            "latencies include that delay"
+        )
+
+
+def print_comparison(baseline: dict, report: dict) -> None:
+    def change(before: Optional[float], after: Optional[float]) -> str:
+        if not before or after is None:
+            return ""
+        return f"{(after - before) / before:+8.1%}"
+
+    print(f"\nCompared with {baseline.get('generated_at', 'baseline')}:")
+    print(f"{'':20}{'baseline':>12}{'current':>12}{'change':>10}")
+    metrics = [("throughput req/s", baseline["throughput_rps"], report["throughput_rps"])]
+    metrics.append(("error rate", baseline["error_rate"], report["error_rate"]))
+    metrics.append(("throttled rate", baseline.get("throttled_rate"), report["throttled_rate"]))
+    for name in ("all", *OPERATIONS):
+        before = baseline["latency"] if name == "all" else baseline["operations"].get(name, {}).get("latency", {})
+        after = report["latency"] if name == "all" else report["operations"][name]["latency"]
+        for percentile in ("p50_ms", "p99_ms", "p99.9_ms"):
+            metrics.append((f"{name} {percentile}", before.get(percentile), after.get(percentile)))
+    for name, before, after in metrics:
+        print(f"{name:20}{format_ms(before):>12}{format_ms(after):>12}{change(before, after):>10}")
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    scenario = Scenario(
+        rate=args.rate,
+        duration=args.duration,
+        read_ratio=args.read_ratio,
+        duplicate_ratio=args.duplicate_ratio,
+        keyspace=args.keyspace,
+        zipf_s=args.zipf_s,
+        preload=min(args.preload, args.keyspace),
+        max_in_flight=args.max_in_flight,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers={"Authorization": f"Bearer {args.token}"},
+        timeout=args.timeout,
+        limits=limits,
+    ) as client:
+        health = await client.get("/health")
+        health.raise_for_status()
+        generator = LoadGenerator(client, scenario, [str(uuid4()) for _ in range(args.apps)])
+        if scenario.preload:
+            print(f"Preloading {scenario.preload} popular emails...")
+            await generator.preload()
+        print(
+            f"Running {scenario.rate:g} req/s for {scenario.duration:g}s against {args.base_url} "
+            f"(reads {scenario.read_ratio:.0%}, duplicate writes {scenario.duplicate_ratio:.0%})"
+        )
+        results = await generator.run()
+    return build_report(scenario, results, args.base_url)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--token", default="bearer-token-static-2024")
+    parser.add_argument(
+        "--apps", type=int, default=100, help="Random app_uuids to spread requests over (rate limits are per app)"
+    )
+    parser.add_argument("--rate", type=float, default=100.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load for")
+    parser.add_argument("--read-ratio", type=float, default=0.9, help="Fraction of requests that are lookups")
+    parser.add_argument(
+        "--duplicate-ratio", type=float, default=0.1, help="Fraction of writes that re-post an already blocked email"
+    )
+    parser.add_argument("--keyspace", type=int, default=10_000, help="Distinct emails looked up")
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent of email popularity")
+    parser.add_argument("--preload", type=int, default=1_000, help="Most popular emails to block before the run")
+    parser.add_argument("--connections", type=int, default=100, help="HTTP connection pool size")
+    parser.add_argument("--max-in-flight", type=int, default=1_000, help="Requests in flight before dropping")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare against")
+    args = parser.parse_args(argv)
+    if args.rate <= 0 or args.duration <= 0 or args.apps <= 0:
+        parser.error("--rate, --duration and --apps must be positive")
+    for name in ("read_ratio", "duplicate_ratio"):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        report = asyncio.run(main_async(args))
+    except PreloadError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+        print(f"\nReport written to {args.output}")
+    if args.compare:
+        with open(args.compare) as baseline:
+            print_comparison(json.load(baseline), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())